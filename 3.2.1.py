@@ -1,19 +1,53 @@
+import io
 import os
+import shutil
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from csv_chunks import split_csv, read_header, read_range_bytes
+from partitions import check_format, clear_partitions, get_partition_path, write_frame
+
+columns = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+
+salary_columns = ['salary_from', 'salary_to']
+
+
+def split_part(file_name, header, start, end, number, path, file_format='csv', dtype=None):
+    df = pd.read_csv(io.BytesIO(read_range_bytes(file_name, start, end)), header=None, names=header,
+                     dtype={x: str for x in header if x not in salary_columns} | (dtype or {}))
+    df['years'] = df['published_at'].str[:4].astype(int)
+    years = []
+    for year, data in df.groupby('years', sort=False):
+        if file_format == 'csv':
+            data[columns].to_csv(os.path.join(path, f'{year}.{number}.part'), index=False)
+        else:
+            partition_path = get_partition_path(path, 'year', year)
+            os.makedirs(partition_path, exist_ok=True)
+            write_frame(data[columns], os.path.join(partition_path, f'part-{number:04d}.{file_format}'), file_format)
+        years.append(year)
+    return years, {x: df[x].dtype.name for x in salary_columns}
+
+
+def get_common_dtypes(parts):
+    dtypes = {}
+    for x in salary_columns:
+        part_dtypes = {part_dtype[x] for _, part_dtype in parts}
+        if len(part_dtypes) == 1:
+            dtypes[x] = part_dtypes.pop()
+        else:
+            dtypes[x] = 'float64' if all(pd.api.types.is_numeric_dtype(y) for y in part_dtypes) else 'str'
+    return dtypes
 
 
 class DataSet:
 
-    def __init__(self, file_name):
+    def __init__(self, file_name, path='years', processes=None, file_format='csv'):
         self.file = self.csv_filter(file_name)
-        path = r'C:\Users\user\Irgashev\years'
-        for f in os.listdir(path):
-            os.remove(os.path.join(path, f))
-        self.files_by_years = self.get_folders(self.file)
+        self.files_by_years = self.get_folders(file_name, path, processes, file_format) if self.file is not None else None
 
     @staticmethod
     def csv_filter(file_name):
-        df = pd.read_csv(file_name)
+        df = pd.read_csv(file_name, nrows=2)
         if len(df) == 0:
             return print('Пустой файл')
         if len(df) == 1:
@@ -21,19 +55,41 @@ class DataSet:
         return df
 
     @staticmethod
-    def get_folders(df):
-        if df is None:
-            return
-        df['years'] = df['published_at'].apply(lambda x: int(x[:4]))
-        years = df['years'].unique()
+    def get_folders(file_name, path='years', processes=None, file_format='csv'):
+        check_format(file_format)
+        processes = processes or os.cpu_count()
+        clear_partitions(path, 'year')
+        header = read_header(file_name)
+        ranges = split_csv(file_name, processes)
+        with ProcessPoolExecutor(min(processes, len(ranges))) as executor:
+            parts = list(executor.map(split_part, [file_name] * len(ranges), [header] * len(ranges),
+                                      [x[0] for x in ranges], [x[1] for x in ranges], range(len(ranges)),
+                                      [path] * len(ranges), [file_format] * len(ranges)))
+            dtypes = get_common_dtypes(parts)
+            rewrite = [i for i, (_, part_dtypes) in enumerate(parts) if part_dtypes != dtypes]
+            for i, part in zip(rewrite, executor.map(
+                    split_part, [file_name] * len(rewrite), [header] * len(rewrite), [ranges[i][0] for i in rewrite],
+                    [ranges[i][1] for i in rewrite], rewrite, [path] * len(rewrite),
+                    [file_format] * len(rewrite), [dtypes] * len(rewrite))):
+                parts[i] = part
+        parts = [years for years, _ in parts]
+        if file_format != 'csv':
+            return {year: get_partition_path(path, 'year', year) for years in parts for year in years}
         files_by_year = {}
-        for year in years:
-            data = df[df['years'] == year]
-            year_file = data[['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']]
-            files_by_year[year] = year_file
-            year_file.to_csv(rf'years\{year}.csv', index=False)
+        for number, years in enumerate(parts):
+            for year in years:
+                files_by_year.setdefault(year, []).append(os.path.join(path, f'{year}.{number}.part'))
+        for year, part_files in files_by_year.items():
+            files_by_year[year] = os.path.join(path, f'{year}.csv')
+            with open(files_by_year[year], 'wb') as year_file:
+                for i, part_file in enumerate(part_files):
+                    with open(part_file, 'rb') as part:
+                        if i != 0:
+                            part.readline()
+                        shutil.copyfileobj(part, year_file)
+                    os.remove(part_file)
         return files_by_year
 
 
-data = DataSet('vacancies_by_year.csv')
-
+if __name__ == '__main__':
+    data = DataSet('vacancies_by_year.csv')
@@ -1,22 +1,50 @@
-import os
+import sys
 import pandas as pd
+import numpy as np
 from multiprocessing import Pool
 import concurrent.futures as cf
 import time
+from concurrent.futures import ThreadPoolExecutor
+from selection import top_n_frame
+from partitions import partition, write_partitions, read_partition, get_format, share_arrays, read_shared
+
+category_columns = {'name': 'category', 'area_name': 'category', 'salary_currency': 'category'}
+statistics_columns = ['name', 'salary_from', 'salary_to', 'area_name']
+
+
+def get_year_statistic(year, salary_from, salary_to, job_mask):
+    salary = pd.DataFrame({'salary_from': salary_from, 'salary_to': salary_to}).mean(axis=1)
+    job_salary = salary[np.asarray(job_mask, dtype=bool)]
+    return [year, int(salary.mean()), len(salary), int(job_salary.mean()), len(job_salary)]
+
+
+def shared_year_statistic(task):
+    year, name, count, size, start, end = task
+    return read_shared(lambda *arrays: get_year_statistic(year, *arrays), name, count, size, start, end)
+
+
+def partition_year_statistic(task):
+    year, path, job = task
+    df = read_partition(path, statistics_columns, category_columns)
+    names = df['name'].cat
+    job_matches = np.asarray(names.categories.str.contains(job, regex=False), dtype=bool)
+    job_mask = np.append(job_matches, False)[names.codes.to_numpy()]
+    return get_year_statistic(year, df['salary_from'].to_numpy(float), df['salary_to'].to_numpy(float), job_mask)
 
 
 class DataSet:
 
-    def __init__(self, file_name):
+    def __init__(self, file_name, path=None, file_format='csv'):
         self.file = self.csv_filter(file_name)
-        path = r'C:\Users\user\Irgashev\years'
-        for f in os.listdir(path):
-            os.remove(os.path.join(path, f))
         self.files_by_years = self.get_folders(self.file)
+        self.executor = ThreadPoolExecutor(1)
+        self.writing = []
+        if path is not None and self.files_by_years is not None:
+            self.writing = write_partitions(self.files_by_years, path, self.executor, file_format)
 
     @staticmethod
     def csv_filter(file_name):
-        df = pd.read_csv(file_name)
+        df = pd.read_csv(file_name, dtype=category_columns)
         if len(df) == 0:
             return print('Пустой файл')
         if len(df) == 1:
@@ -27,15 +55,14 @@ class DataSet:
     def get_folders(df):
         if df is None:
             return
-        df['years'] = df['published_at'].apply(lambda x: int(x[:4]))
-        years = df['years'].unique()
-        files_by_year = {}
-        for year in years:
-            data = df[df['years'] == year]
-            year_file = data[['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']]
-            files_by_year[year] = year_file
-            year_file.to_csv(rf'years\{year}.csv', index=False)
-        return files_by_year
+        df['years'] = df['published_at'].str[:4].astype(int)
+        return partition(df, 'years', ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name',
+                                       'published_at'])
+
+    def wait(self):
+        for future in self.writing:
+            future.result()
+        self.executor.shutdown()
 
 
 class Statistics:
@@ -43,6 +70,7 @@ class Statistics:
         self.job = job
         self.big_file = big_file
         self.files_by_years = files_by_years
+        self.job_matches = self.get_job_matches()
         self.result = []
 
     def year_statistic(self):
@@ -51,19 +79,34 @@ class Statistics:
         job_salary_year = {}
         job_salary_count = {}
         for year, df in self.files_by_years.items():
-            df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-            df_job = df[df['name'].str.contains(self.job)]
-            salary_year[year] = int(df['salary'].mean())
+            df = self.get_partition(df)
+            salary = df[['salary_from', 'salary_to']].mean(axis=1)
+            job_salary = salary[self.get_job_mask(df)]
+            salary_year[year] = int(salary.mean())
             salary_count[year] = len(df)
-            job_salary_year[year] = int(df_job['salary'].mean())
-            job_salary_count[year] = len(df_job)
+            job_salary_year[year] = int(job_salary.mean())
+            job_salary_count[year] = len(job_salary)
         return salary_year, salary_count, job_salary_year, job_salary_count
 
+    def get_job_matches(self):
+        return np.asarray(self.big_file['name'].cat.categories.str.contains(self.job, regex=False), dtype=bool)
+
+    def get_job_mask(self, df):
+        names = df['name'].cat
+        codes = names.codes.to_numpy()
+        if names.categories.equals(self.big_file['name'].cat.categories):
+            return np.append(self.job_matches, False)[codes]
+        return np.append(np.asarray(names.categories.str.contains(self.job, regex=False), dtype=bool), False)[codes]
+
+    @staticmethod
+    def get_partition(df):
+        return read_partition(df, statistics_columns, category_columns) if isinstance(df, str) else df
+
     def one_year_statistic(self, item):
-        df = item[1]
-        df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-        df_job = df[df['name'].str.contains(self.job)]
-        return [item[0], int(df['salary'].mean()), len(df), int(df_job['salary'].mean()), len(df_job)]
+        df = self.get_partition(item[1])
+        salary = df[['salary_from', 'salary_to']].mean(axis=1)
+        job_salary = salary[self.get_job_mask(df)]
+        return [item[0], int(salary.mean()), len(df), int(job_salary.mean()), len(job_salary)]
 
     def year_statistic_mp(self):
         p = Pool()
@@ -78,19 +121,36 @@ class Statistics:
         result = tuple(cf.ProcessPoolExecutor().map(self.one_year_statistic, self.files_by_years.items()))
         return {x[0]: x[1] for x in result}, {x[0]: x[2] for x in result}, {x[0]: x[3] for x in result}, {x[0]: x[4] for x in result}
 
-    def city_statistic(self):
+    def year_statistic_shared(self):
+        if all(isinstance(x, str) for x in self.files_by_years.values()):
+            with cf.ProcessPoolExecutor() as executor:
+                result = tuple(executor.map(partition_year_statistic,
+                                            [(year, path, self.job) for year, path in self.files_by_years.items()]))
+        else:
+            shared, count, size, bounds = share_arrays({
+                year: (df['salary_from'].to_numpy(float), df['salary_to'].to_numpy(float), self.get_job_mask(df))
+                for year, df in self.files_by_years.items()})
+            try:
+                with cf.ProcessPoolExecutor() as executor:
+                    result = tuple(executor.map(shared_year_statistic,
+                                                [(year, shared.name, count, size, start, end)
+                                                 for year, (start, end) in bounds.items()]))
+            finally:
+                shared.close()
+                shared.unlink()
+        return {x[0]: x[1] for x in result}, {x[0]: x[2] for x in result}, {x[0]: x[3] for x in result}, {x[0]: x[4] for x in result}
+
+    def city_statistic(self, n=10, threshold=0.01):
         total = len(self.big_file)
         self.big_file['salary'] = self.big_file[['salary_from', 'salary_to']].mean(axis=1)
-        self.big_file['count'] = self.big_file.groupby('area_name')['area_name'].transform('count')
-        df_big = self.big_file[self.big_file['count'] > 0.01 * total].groupby('area_name', as_index=False)
+        self.big_file['count'] = self.big_file.groupby('area_name', observed=True)['area_name'].transform('count')
+        df_big = self.big_file[self.big_file['count'] > threshold * total].groupby('area_name', as_index=False, observed=True)
 
-        df_salary_area = df_big['salary'].mean().sort_values(by='salary', ascending=False)
-        df_top_salary_area = df_salary_area.head(10)
-        top_salary = df_salary_area['salary'].apply(lambda x: int(x))
+        df_top_salary_area = top_n_frame(df_big['salary'].mean(), 'salary', n)
+        top_salary = df_top_salary_area['salary'].apply(lambda x: int(x))
         salary_by_cities = dict(zip(df_top_salary_area['area_name'], top_salary))
 
-        df_count_area = df_big['count'].mean().sort_values(by='count', ascending=False)
-        df_top_count_area = df_count_area.head(10)
+        df_top_count_area = top_n_frame(df_big['count'].mean(), 'count', n)
         top_cities = df_top_count_area['count'].apply(lambda x: round(x / total, 4))
         count_by_cities = dict(zip(df_top_count_area['area_name'], top_cities))
         return salary_by_cities, count_by_cities
@@ -104,8 +164,12 @@ class Statistics:
         # year_data = self.year_statistic_mp()
         # print("--- %s seconds ---" % (time.time() - start_time))
 
+        # start_time = time.time()
+        # year_data = self.year_statistic_with_cf()
+        # print("--- %s seconds ---" % (time.time() - start_time))
+
         start_time = time.time()
-        year_data = self.year_statistic_with_cf()
+        year_data = self.year_statistic_shared()
         print("--- %s seconds ---" % (time.time() - start_time))
 
         city_data = self.city_statistic()
@@ -118,6 +182,7 @@ class Statistics:
 
 
 if __name__ == '__main__':
-    data = DataSet('vacancies_by_year.csv')
+    data = DataSet('vacancies_by_year.csv', 'years', get_format(sys.argv[1:]))
     statistic = Statistics('Аналитик', data.file, data.files_by_years)
     statistic.print_statistic()
+    data.wait()
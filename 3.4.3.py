@@ -1,4 +1,4 @@
-import os
+import sys
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, Side, Border
@@ -6,30 +6,36 @@ import matplotlib.pyplot as plt
 import numpy as np
 from jinja2 import Environment, FileSystemLoader
 import pdfkit
+from concurrent.futures import ThreadPoolExecutor
+from selection import top_n_frame
+from partitions import partition, write_partitions, read_partition, get_format
+
+category_columns = {'name': 'category', 'area_name': 'category', 'salary_currency': 'category'}
+statistics_columns = ['name', 'salary_from', 'salary_to', 'area_name']
 
 
 class DataSet:
 
-    def __init__(self, file_name):
-        self.file = pd.read_csv(file_name)
-        path = r'C:\Users\user\Irgashev\years'
-        for f in os.listdir(path):
-            os.remove(os.path.join(path, f))
+    def __init__(self, file_name, path=None, file_format='csv'):
+        self.file = pd.read_csv(file_name, dtype=category_columns)
         self.files_by_years = self.get_folders(self.file)
+        self.executor = ThreadPoolExecutor(1)
+        self.writing = []
+        if path is not None and self.files_by_years is not None:
+            self.writing = write_partitions(self.files_by_years, path, self.executor, file_format)
 
     @staticmethod
     def get_folders(df):
         if df is None:
             return
-        df['years'] = df['published_at'].apply(lambda x: int(x[:4]))
-        years = df['years'].unique()
-        files_by_year = {}
-        for year in years:
-            data = df[df['years'] == year]
-            year_file = data[['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']]
-            files_by_year[year] = year_file
-            year_file.to_csv(rf'years\{year}.csv', index=False)
-        return files_by_year
+        df['years'] = df['published_at'].str[:4].astype(int)
+        return partition(df, 'years', ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name',
+                                       'published_at'])
+
+    def wait(self):
+        for future in self.writing:
+            future.result()
+        self.executor.shutdown()
 
 
 class Statistics:
@@ -38,14 +44,29 @@ class Statistics:
         self.region = region
         self.big_file = big_file
         self.files_by_years = files_by_years
+        self.job_matches = self.get_job_matches()
         self.salary_statistic = self.get_salary_statistic()
         self.city_statistic = self.get_city_statistic()
 
+    def get_job_matches(self):
+        return np.asarray(self.big_file['name'].cat.categories.str.contains(self.job, regex=False), dtype=bool)
+
+    def get_job_mask(self, df):
+        names = df['name'].cat
+        codes = names.codes.to_numpy()
+        if names.categories.equals(self.big_file['name'].cat.categories):
+            return np.append(self.job_matches, False)[codes]
+        return np.append(np.asarray(names.categories.str.contains(self.job, regex=False), dtype=bool), False)[codes]
+
+    @staticmethod
+    def get_partition(df):
+        return read_partition(df, statistics_columns, category_columns) if isinstance(df, str) else df
+
     def one_year_statistic(self, item):
-        df = item[1]
-        df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-        df_job = df[(df['name'].str.contains(self.job)) & (df['area_name'] == self.region)]
-        return [item[0], int(df_job['salary'].mean()), len(df_job)]
+        df = self.get_partition(item[1])
+        mask = (self.get_job_mask(df)) & (df['area_name'] == self.region)
+        job_salary = df[['salary_from', 'salary_to']].mean(axis=1)[mask]
+        return [item[0], int(job_salary.mean()), len(job_salary)]
 
     def get_salary_statistic(self):
         result = []
@@ -53,19 +74,17 @@ class Statistics:
             result.append(self.one_year_statistic(item))
         return result
 
-    def get_city_statistic(self):
+    def get_city_statistic(self, n=10, threshold=0.01):
         total = len(self.big_file)
         self.big_file['salary'] = self.big_file[['salary_from', 'salary_to']].mean(axis=1)
-        self.big_file['count'] = self.big_file.groupby('area_name')['area_name'].transform('count')
-        df_big = self.big_file[self.big_file['count'] > 0.01 * total].groupby('area_name', as_index=False)
+        self.big_file['count'] = self.big_file.groupby('area_name', observed=True)['area_name'].transform('count')
+        df_big = self.big_file[self.big_file['count'] > threshold * total].groupby('area_name', as_index=False, observed=True)
 
-        df_salary_area = df_big['salary'].mean().sort_values(by='salary', ascending=False)
-        df_top_salary_area = df_salary_area.head(10)
-        top_salary = df_salary_area['salary'].apply(lambda x: int(x))
+        df_top_salary_area = top_n_frame(df_big['salary'].mean(), 'salary', n)
+        top_salary = df_top_salary_area['salary'].apply(lambda x: int(x))
         salary_by_cities = dict(zip(df_top_salary_area['area_name'], top_salary))
 
-        df_count_area = df_big['count'].mean().sort_values(by='count', ascending=False)
-        df_top_count_area = df_count_area.head(10)
+        df_top_count_area = top_n_frame(df_big['count'].mean(), 'count', n)
         top_cities = df_top_count_area['count'].apply(lambda x: round(x / total, 4))
         count_by_cities = dict(zip(df_top_count_area['area_name'], top_cities))
         return salary_by_cities, count_by_cities
@@ -153,10 +172,11 @@ class ReportPng:
         plt.show()
 
 
-data = DataSet('vacancies_by_year.csv')
+data = DataSet('vacancies_by_year.csv', 'years', get_format(sys.argv[1:]))
 job = 'Аналитик'
 region = 'Москва'
 statistic = Statistics(job, region, data.file, data.files_by_years)
+data.wait()
 
 wb = ReportExcel()
 salary_list, city_list = statistic.get_excel_data()
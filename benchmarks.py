@@ -0,0 +1,181 @@
+import re
+import csv
+import os
+import shutil
+import sys
+import time
+import random
+import tempfile
+from datetime import datetime
+from full import DataSet, get_rows, parse_published_at, StatisticsSnapshot
+from create_big_csv import NewCsv
+
+header = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+          'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+
+
+def create_vacancies_csv(length):
+    file_name = os.path.join(tempfile.gettempdir(), f'vacancies_{length}.csv')
+    if os.path.exists(file_name):
+        return file_name
+    random.seed(0)
+    words = ['Python', 'SQL', 'Аналитик', 'опыт', 'работы', 'команда', 'разработка', 'данные', 'отчеты', 'задачи']
+    with open(file_name, 'w', encoding='utf_8_sig', newline='') as file_csv:
+        writer = csv.writer(file_csv)
+        writer.writerow(header)
+        for i in range(length):
+            descr = ''.join(f'<p><strong>{random.choice(words)}</strong>  {" ".join(random.choices(words, k=20))}</p>\n'
+                            for _ in range(5))
+            writer.writerow([f'Аналитик {i % 100}', descr, 'SQL\nPython\nExcel', 'between1And3', 'False',
+                             f'Компания {i % 1000}', '30000', '50000', 'True', 'RUR', 'Москва',
+                             f'2022-{i % 12 + 1:02d}-{i % 28 + 1:02d}T11:44:58+0300'])
+    return file_name
+
+
+def read_rows(file_name):
+    rows = get_rows(file_name)
+    next(rows)
+    return rows
+
+
+def measure(title, length, function):
+    start_time = time.time()
+    function()
+    seconds = time.time() - start_time
+    print(f'{title}: {seconds:.2f} s, {int(length / seconds)} rows/s')
+    return seconds
+
+
+def old_clean_rows(reader):
+    for line in reader:
+        vacancy = []
+        for i in range(0, len(line)):
+            value = re.sub(re.compile(r"<[^>]*>"), "", line[i])
+            value = " ".join(value.split()) if i != 2 else " ".join(value.split(' '))
+            vacancy.append(value)
+        yield vacancy
+
+
+def benchmark_clean_rows(length):
+    file_name = create_vacancies_csv(length)
+    measure('Чтение csv', length, lambda: all(True for _ in read_rows(file_name)))
+    old = measure('Очистка по ячейкам', length, lambda: all(True for _ in old_clean_rows(read_rows(file_name))))
+    new = measure('Очистка по столбцам', length,
+                  lambda: all(True for _ in DataSet.clean_rows(read_rows(file_name), header)))
+    print(f'Ускорение: {old / new:.2f}')
+
+
+def benchmark_parse_published_at(length):
+    random.seed(0)
+    dates = [f'20{random.randint(10, 22)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}T'
+             f'{random.randint(0, 23):02d}:{random.randint(0, 59):02d}:{random.randint(0, 59):02d}+0300'
+             for _ in range(length)]
+    old = measure('strptime', length,
+                  lambda: [datetime.strptime(x, '%Y-%m-%dT%H:%M:%S%z').timestamp() for x in dates])
+    new = measure('parse_published_at', length, lambda: [parse_published_at(x) for x in dates])
+    print(f'Ускорение: {old / new:.2f}')
+
+
+def benchmark_cache(length):
+    file_name = create_vacancies_csv(length)
+    shutil.rmtree(file_name + '.cache', ignore_errors=True)
+    old = measure('Вакансии без кеша', length, lambda: DataSet(file_name))
+    new = measure('Вакансии из кеша', length, lambda: DataSet(file_name))
+    print(f'Ускорение: {old / new:.2f}')
+
+
+def benchmark_parallel_statistics(length):
+    file_name = create_vacancies_csv(length)
+    results = []
+    for processes in range(1, (os.cpu_count() or 1) + 1):
+        snapshot = StatisticsSnapshot()
+        measure(f'Снимок статистики, процессов: {processes}', length,
+                lambda: snapshot.update(file_name, processes))
+        results.append(snapshot.get_result('Аналитик').get_png_data())
+    print(f'Результаты совпадают: {all(x == results[0] for x in results)}')
+
+
+def benchmark_snapshot(length):
+    file_name = os.path.join(tempfile.gettempdir(), f'vacancies_{length}_growing.csv')
+    shutil.copyfile(create_vacancies_csv(length), file_name)
+    shutil.rmtree(file_name + '.cache', ignore_errors=True)
+    snapshot = StatisticsSnapshot()
+    old = measure('Снимок статистики по всему файлу', length, lambda: snapshot.update(file_name))
+    delta = max(1, length // 100)
+    with open(create_vacancies_csv(delta), encoding='utf_8_sig') as new_rows, open(file_name, 'a', encoding='utf-8') as file:
+        next(new_rows)
+        shutil.copyfileobj(new_rows, file)
+    new = measure('Добавление новых вакансий', delta, lambda: snapshot.update(file_name))
+    print(f'Ускорение: {old / new:.2f}')
+
+
+def benchmark_multi_result(length, jobs_count=50):
+    file_name = create_vacancies_csv(length)
+    snapshot = StatisticsSnapshot()
+    snapshot.update(file_name)
+    jobs = [f'Аналитик {i}' for i in range(jobs_count)]
+    old = measure(f'Профессий: {jobs_count}, по одной', length * jobs_count,
+                  lambda: [snapshot.get_result(job) for job in jobs])
+    new = measure(f'Профессий: {jobs_count}, за один проход', length * jobs_count,
+                  lambda: snapshot.get_results(jobs))
+    print(f'Ускорение: {old / new:.2f}')
+
+
+def create_currencies_csv(length):
+    file_name = os.path.join(tempfile.gettempdir(), f'vacancies_dif_currencies_{length}.csv')
+    if os.path.exists(file_name):
+        return file_name
+    random.seed(0)
+    with open(file_name, 'w', encoding='utf_8_sig', newline='') as file_csv:
+        writer = csv.writer(file_csv)
+        writer.writerow(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'])
+        for i in range(length):
+            writer.writerow([f'Аналитик {i % 100}', random.choice(['', '30000', '45000.5']), random.choice(['', '50000']),
+                             random.choice(['RUR', 'RUR', 'USD', 'EUR', 'KZT', '']), 'Москва',
+                             f'20{i % 20 + 3:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}T11:44:58+0300'])
+    return file_name
+
+
+def benchmark_create_big_csv(length):
+    import pandas as pd
+    df = pd.read_csv(create_currencies_csv(length))
+    currency_df = pd.DataFrame([[f'20{i // 12 + 3:02d}-{i % 12 + 1:02d}', 60 + i / 10, 70 + i / 10, 0.13]
+                                for i in range(240)], columns=['date', 'USD', 'EUR', 'KZT'])
+    new_csv = NewCsv(df, currency_df)
+    path = os.path.join(tempfile.gettempdir(), 'more_years')
+    for processes in range(1, (os.cpu_count() or 1) + 1):
+        measure(f'Перевод в рубли по годам, процессов: {processes}', length,
+                lambda: new_csv.create_all_csv(path, processes=processes))
+    measure('Перевод в рубли в один файл', length,
+            lambda: new_csv.create_all_csv(file_name=os.path.join(tempfile.gettempdir(), 'more_years.csv')))
+
+
+def benchmark_job_match(length, job='Аналитик 1'):
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        'year_statistics', os.path.join(os.path.dirname(os.path.abspath(__file__)), '3.2.2-3.2,3.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    data = module.DataSet(create_currencies_csv(length))
+    statistic = module.Statistics(job, data.file, data.files_by_years)
+    names = {year: df['name'].astype(object) for year, df in data.files_by_years.items()}
+    old, new = [], []
+    old_time = measure('Профессия через str.contains', length, lambda: old.extend(
+        len(df[names[year].str.contains(job, regex=False, na=False)]) for year, df in data.files_by_years.items()))
+    new_time = measure('Профессия через категории', length, lambda: new.extend(
+        len(df[statistic.get_job_mask(df)]) for df in data.files_by_years.values()))
+    data.wait()
+    print(f'Ускорение: {old_time / new_time:.2f}')
+    print(f'Результаты совпадают: {old == new}')
+
+
+if __name__ == '__main__':
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    benchmark_clean_rows(length)
+    benchmark_parse_published_at(length)
+    benchmark_cache(length)
+    benchmark_parallel_statistics(length)
+    benchmark_snapshot(length)
+    benchmark_multi_result(length)
+    benchmark_create_big_csv(length)
+    benchmark_job_match(length)
@@ -1,53 +1,58 @@
-import math
+import os
 import pandas as pd
-import requests
-from xml.etree import ElementTree
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-from statistics import mean
 import concurrent.futures as cf
-from multiprocessing import Pool
+from currency_rates import convert_salaries
+from rate_table import RateTable
+from partitions import partition, clear_partitions
+
+columns = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+rate_table = None
+
+
+def set_rate_table(table):
+    global rate_table
+    rate_table = table
+
+
+def convert_year(year, df, path=None):
+    df = convert_salaries(df, rate_table)
+    if path is None:
+        return year, df
+    df.to_csv(os.path.join(path, f'{year}.csv'), index=False)
+    return year, len(df)
 
 
 class NewCsv:
     def __init__(self, original_df, currency_df):
         self.original_df = original_df
         self.currency_df = currency_df
+        self.rate_table = RateTable.from_frame(currency_df)
+
+    def create_one_csv(self, df, file_name):
+        convert_salaries(df, self.rate_table).to_csv(file_name, index=False)
 
-    def create_one_csv(self, df):
-        new_df = pd.DataFrame(columns=['name', 'salary', 'area_name', 'published_at'])
-        for i in range(len(df)):
-            salary = None
-            currency = 1
-            row = list(df.loc[i])
-            print(row[6])
-            salary_list = list(filter(lambda x: not math.isnan(x), row[1:3]))
-            if len(salary_list) != 0:
-                salary = mean(salary_list)
-            if row[3] != 'RUR':
-                if row[3] in list(self.currency_df.columns):
-                    currency = self.currency_df[self.currency_df['date'] == row[5][:7]][row[3]].iloc[0]
-            if salary is not None and currency is not None:
-                salary = round(salary * currency)
-            if salary is None or currency is None:
-                salary = None
-            new_df.loc[len(new_df)] = [row[0]] + [salary] + row[4:6]
-        new_df.to_csv(rf'more_years\{len(df)}.csv', index=False)
-
-    def create_all_csv(self):
-        self.original_df['years'] = self.original_df['published_at'].apply(lambda x: int(x[:4]))
-        years = self.original_df['years'].unique()
-        df_list = [self.original_df[self.original_df['years'] == x] for x in years]
-        df_list = [df.reset_index(drop=True) for df in df_list]
-        # for df in df_list:
-        #     print(df)
-        #     self.create_one_csv(df)
-        cf.ProcessPoolExecutor().map(self.create_one_csv, tuple(df_list))
+    def create_all_csv(self, path='more_years', file_name=None, processes=None):
+        self.original_df['years'] = self.original_df['published_at'].str[:4].astype(int)
+        df_by_years = partition(self.original_df, 'years', columns)
+        if file_name is None:
+            clear_partitions(path, 'year')
+        processes = max(1, min(processes or os.cpu_count(), len(df_by_years)))
+        results = {}
+        with cf.ProcessPoolExecutor(processes, initializer=set_rate_table, initargs=(self.rate_table,)) as executor:
+            futures = [executor.submit(convert_year, year, df, None if file_name else path)
+                       for year, df in df_by_years.items()]
+            for done, future in enumerate(cf.as_completed(futures), 1):
+                year, result = future.result()
+                results[year] = result
+                print(f'Год {year} готов ({done}/{len(futures)})')
+        if file_name is not None and results:
+            pd.concat([results[x] for x in df_by_years]).sort_index().to_csv(file_name, index=False)
+        return {x: results[x] for x in df_by_years}
 
 
 if __name__ == '__main__':
     data = pd.read_csv('vacancies_dif_currencies.csv')
     currency_csv = pd.read_csv('currency.csv')
     new_csv = NewCsv(data, currency_csv)
-    # new_csv.create_one_csv(1000)
+    # new_csv.create_one_csv(data, 'new_csv.csv')
     new_csv.create_all_csv()
@@ -0,0 +1,133 @@
+import os
+import csv
+
+
+def find_record_borders(file, offsets, block_size=1 << 22):
+    """
+    Для каждого смещения из offsets находит начало первой записи csv файла после него. Файл читается блоками,
+    кавычки считаются функцией bytes.count: перевод строки завершает запись, только если перед ним четное число
+    кавычек от начала файла, иначе он находится внутри поля в кавычках
+
+    Args:
+        file: Файл, открытый в двоичном режиме
+        offsets (list): Смещения в байтах по возрастанию
+        block_size (int): Размер блока чтения в байтах
+
+    Returns:
+        list: Начала записей в байтах по возрастанию, без повторов
+    """
+    borders = []
+    offsets = iter(offsets)
+    target = next(offsets, None)
+    quotes = 0
+    position = 0
+    searching = False
+    file.seek(0)
+    while target is not None:
+        block = file.read(block_size)
+        if not block:
+            break
+        offset = 0
+        while target is not None:
+            if not searching:
+                if target >= position + len(block):
+                    break
+                quotes += block.count(b'"', offset, target - position)
+                offset = target - position
+                searching = True
+            newline = block.find(b'\n', offset)
+            if newline == -1:
+                break
+            quotes += block.count(b'"', offset, newline)
+            offset = newline + 1
+            if quotes % 2 == 0:
+                borders.append(position + offset)
+                searching = False
+                while target is not None and target < borders[-1]:
+                    target = next(offsets, None)
+        quotes += block.count(b'"', offset)
+        position += len(block)
+    return borders
+
+
+def split_csv(file_name, parts, min_size=1 << 20):
+    """
+    Делит записи csv файла (без строки заголовков) на части примерно одинакового размера в байтах. Границы частей
+    совпадают с началом записей, в том числе если поля в кавычках содержат переводы строк, поэтому каждая часть
+    читается независимо. Части не меньше min_size байт, поэтому маленький файл не делится
+
+    Args:
+        file_name (str): Имя файла
+        parts (int): Желаемое число частей
+        min_size (int): Минимальный размер части в байтах
+
+    Returns:
+        list: Границы частей (начало, конец) в байтах
+    """
+    size = os.path.getsize(file_name)
+    parts = max(1, min(parts, size // min_size))
+    with open(file_name, 'rb') as file:
+        borders = find_record_borders(file, [size * i // parts for i in range(parts)])
+    borders.append(size)
+    return [(borders[i], borders[i + 1]) for i in range(len(borders) - 1) if borders[i] < borders[i + 1]]
+
+
+def read_header(file_name):
+    """
+    Args:
+        file_name (str): Имя файла
+
+    Returns:
+        list: Заголовки столбцов, None если файл пустой
+    """
+    with open(file_name, encoding='utf_8_sig', newline='') as file:
+        return next(csv.reader(file), None)
+
+
+def read_range(file_name, start, end):
+    """
+    Читает записи csv файла от start до end байт, полученных из split_csv. Переводы строк '\\r\\n' и '\\r'
+    заменяются на '\\n', как при чтении файла в текстовом режиме, поэтому записи совпадают с последовательным чтением
+
+    Args:
+        file_name (str): Имя файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+
+    Yields:
+        list: Запись csv файла
+    """
+    def read_lines():
+        position = start
+        while position < end:
+            line = file.readline()
+            if not line:
+                return
+            position += len(line)
+            line = line.decode('utf-8')
+            if '\r' not in line:
+                yield line
+                continue
+            lines = line.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+            yield from (x + '\n' for x in lines[:-1])
+            if lines[-1]:
+                yield lines[-1]
+
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        yield from csv.reader(read_lines())
+
+
+def read_range_bytes(file_name, start, end):
+    """
+    Args:
+        file_name (str): Имя файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+
+    Returns:
+        bytes: Записи csv файла от start до end байт
+    """
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        return file.read(end - start)
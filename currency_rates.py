@@ -0,0 +1,156 @@
+import os
+import time
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from rate_table import RateTable
+
+cbr_url = 'http://www.cbr.ru/scripts/XML_daily.asp'
+
+
+def parse_rates(content, currencies):
+    """
+    Args:
+        content (bytes): Ответ XML_daily.asp в кодировке WINDOWS-1251
+        currencies (list): Коды валют
+
+    Returns:
+        dict: key - код валюты, value - курс за одну единицу валюты с точностью 7 знаков, None если курса нет
+    """
+    rates = {x: None for x in currencies}
+    for valute in ElementTree.fromstring(content.decode('WINDOWS-1251')).findall('./Valute'):
+        code = valute.find('./CharCode').text
+        if code in rates:
+            rates[code] = round(float(valute.find('./Value').text.replace(',', '.'))
+                                / int(valute.find('./Nominal').text), 7)
+            if all(rates.values()):
+                break
+    return rates
+
+
+class RateFetcher:
+    """
+    Загрузка курсов валют ЦБ РФ на 28 число месяцев. Месяцы загружаются параллельно в пуле потоков через одну
+    сессию с пулом соединений, при ошибке запрос повторяется с экспоненциальной задержкой. Ответ за каждый
+    прошедший месяц сохраняется в папку кеша и больше не запрашивается
+
+    Attributes:
+        path (str): Папка кеша, файл '<год>-<месяц>.xml' на каждый месяц
+        url (str): Адрес XML_daily.asp
+        workers (int): Наибольшее число одновременных запросов
+        retries (int): Число повторов запроса после ошибки
+        backoff (float): Задержка перед первым повтором в секундах, каждый следующий повтор ждет вдвое дольше
+        timeout (float): Время ожидания ответа в секундах
+        session (Session): Сессия requests
+    """
+    def __init__(self, path='cbr_cache', url=cbr_url, workers=8, retries=3, backoff=0.5, timeout=10):
+        """
+        Args:
+            path (str): Папка кеша
+            url (str): Адрес XML_daily.asp
+            workers (int): Наибольшее число одновременных запросов
+            retries (int): Число повторов запроса после ошибки
+            backoff (float): Задержка перед первым повтором в секундах
+            timeout (float): Время ожидания ответа в секундах
+        """
+        self.path = path
+        self.url = url
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_cache_name(self, month):
+        """
+        Args:
+            month (str): Месяц в формате 'мм/гггг'
+
+        Returns:
+            str: Файл кеша месяца
+        """
+        return os.path.join(self.path, f'{month[3:]}-{month[:2]}.xml')
+
+    def download(self, month):
+        """
+        Args:
+            month (str): Месяц в формате 'мм/гггг'
+
+        Returns:
+            bytes: Ответ XML_daily.asp на 28 число месяца
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(self.url, params={'date_req': f'28/{month}'}, timeout=self.timeout)
+                response.raise_for_status()
+                return response.content
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def get_month(self, month):
+        """
+        Возвращает ответ за месяц из кеша или загружает его. В кеш попадают только месяцы, 28 число которых
+        уже прошло, курсы на будущие даты ЦБ еще может изменить
+
+        Args:
+            month (str): Месяц в формате 'мм/гггг'
+
+        Returns:
+            bytes: Ответ XML_daily.asp на 28 число месяца
+        """
+        cache_name = self.get_cache_name(month)
+        if os.path.exists(cache_name):
+            with open(cache_name, 'rb') as file:
+                return file.read()
+        content = self.download(month)
+        if date(int(month[3:]), int(month[:2]), 28) < date.today():
+            os.makedirs(self.path, exist_ok=True)
+            with open(cache_name + '.tmp', 'wb') as file:
+                file.write(content)
+            os.replace(cache_name + '.tmp', cache_name)
+        return content
+
+    def get_rates(self, months, currencies):
+        """
+        Args:
+            months (list): Месяцы в формате 'мм/гггг'
+            currencies (list): Коды валют
+
+        Returns:
+            dict: key - месяц, value - словарь курсов из parse_rates
+        """
+        with ThreadPoolExecutor(self.workers) as executor:
+            contents = executor.map(self.get_month, months)
+            return {month: parse_rates(content, currencies) for month, content in zip(months, contents)}
+
+
+def convert_salaries(df, rates):
+    """
+    Переводит зарплаты вакансий в рубли без цикла по строкам: курс каждой вакансии берется из матрицы RateTable
+    по месяцу публикации и валюте. Как и при переводе по строкам, зарплата - среднее заданных границ, для рублей
+    и валют, которых нет в таблице курсов, курс равен 1, при отсутствии курса зарплата пустая, округление -
+    к ближайшему четному
+
+    Args:
+        df (DataFrame): Вакансии со столбцами name, salary_from, salary_to, salary_currency, area_name, published_at
+        rates (RateTable or DataFrame): Курсы валют, DataFrame - со столбцом date в формате 'гггг-мм' и столбцом
+            на каждую валюту
+
+    Returns:
+        DataFrame: Столбцы name, salary (Int64, в рублях), area_name, published_at
+    """
+    if not isinstance(rates, RateTable):
+        rates = RateTable.from_frame(rates)
+    salary = np.rint(rates.convert(df[['salary_from', 'salary_to']].mean(axis=1).to_numpy(float),
+                                   df['salary_currency'].to_numpy(object), df['published_at'].to_numpy(object), 1.0))
+    return pd.DataFrame({'name': df['name'], 'salary': pd.Series(pd.array(salary, dtype='Int64'), index=df.index),
+                         'area_name': df['area_name'], 'published_at': df['published_at']})
@@ -0,0 +1,121 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+version = 1
+
+
+def get_profile_path(file_name):
+    """
+    Args:
+        file_name (str): Имя csv файла
+
+    Returns:
+        str: Файл профиля в папке кеша рядом с csv файлом
+    """
+    return os.path.join(file_name + '.cache', 'profile.json')
+
+
+def get_file_key(file_name):
+    """
+    Args:
+        file_name (str): Имя csv файла
+
+    Returns:
+        list: Размер и время изменения csv файла
+    """
+    stat = os.stat(file_name)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def get_moments(published_at):
+    """
+    Переводит даты публикации в формате '%Y-%m-%dT%H:%M:%S%z' в моменты времени UTC. Дата и время разбираются
+    одним вызовом to_datetime без часового пояса, а сдвиг вычитается отдельно для каждого из немногих разных
+    часовых поясов, это в несколько раз быстрее разбора строк со смешанными часовыми поясами. Пустые даты
+    (код -1 у factorize) получают нулевой сдвиг и становятся NaT
+
+    Args:
+        published_at (Series): Даты публикации
+
+    Returns:
+        Series: Моменты времени UTC без часового пояса
+    """
+    codes, zones = pd.factorize(published_at.str[19:])
+    shifts = np.array([(-1 if x[0] == '-' else 1) * (int(x[1:3]) * 3600 + int(x[-2:]) * 60) for x in zones] + [0],
+                      dtype=np.int64)
+    return pd.to_datetime(published_at.str[:19], format='%Y-%m-%dT%H:%M:%S') \
+        - pd.to_timedelta(shifts[codes], unit='s')
+
+
+def create_profile(df):
+    """
+    Составляет профиль вакансий за один векторный проход: даты публикации разбираются один раз функцией
+    get_moments, границы дат ищутся через idxmin и idxmax по годам, частоты валют - через value_counts.
+    Пустые даты не учитываются, если дат нет совсем, границы равны None
+
+    Args:
+        df (DataFrame): Вакансии со столбцами salary_currency и published_at
+
+    Returns:
+        dict: Профиль: число строк, частоты валют в порядке первого появления (без пустых), доли пустых значений
+            по столбцам, первая, самая ранняя и самая поздняя даты публикации и для каждого года (по записи даты)
+            самая ранняя и самая поздняя даты
+    """
+    published_at = df['published_at']
+    if not pd.api.types.is_string_dtype(published_at):
+        published_at = published_at.astype(object)
+    moments = get_moments(published_at)
+    dated = moments.notna().any()
+    years = published_at.str[:4]
+    grouped = moments.groupby(years.to_numpy(), sort=True)
+    first_rows = grouped.idxmin()
+    last_rows = grouped.idxmax()
+    currencies = df['salary_currency'].value_counts(sort=False)
+    return {
+        'rows': len(df),
+        'currencies': {str(x): int(y) for x, y in currencies.items()},
+        'null_rates': {str(x): float(y) for x, y in df.isna().mean().fillna(0).items()},
+        'published_at': {
+            'first': published_at.iloc[0] if len(df) and pd.notna(published_at.iloc[0]) else None,
+            'min': published_at.loc[moments.idxmin()] if dated else None,
+            'max': published_at.loc[moments.idxmax()] if dated else None,
+        },
+        'years': {str(x): [published_at.loc[first_rows[x]], published_at.loc[last_rows[x]]]
+                  for x in first_rows.index},
+    }
+
+
+def load_profile(file_name, df=None):
+    """
+    Возвращает профиль csv файла из кеша, а если кеша нет или файл изменился (размер или время изменения) -
+    составляет профиль и сохраняет его
+
+    Args:
+        file_name (str): Имя csv файла
+        df (DataFrame): Уже прочитанные вакансии файла, None - прочитать файл
+
+    Returns:
+        dict: Профиль из create_profile
+    """
+    path = get_profile_path(file_name)
+    file_key = get_file_key(file_name)
+    try:
+        with open(path, encoding='utf-8') as file:
+            cached = json.load(file)
+        if cached.get('version') == version and cached.get('file_key') == file_key:
+            return cached['profile']
+    except (OSError, ValueError):
+        pass
+    if df is None:
+        df = pd.read_csv(file_name)
+    profile = create_profile(df)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump({'version': version, 'file_key': file_key, 'profile': profile}, file, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+    return profile
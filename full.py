@@ -1,8 +1,24 @@
+import os
 import re
+import sys
 import csv
+import json
+import mmap
+import heapq
+import shutil
+import hashlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from csv_chunks import split_csv, read_range, read_header
+from selection import top_n
+from substrings import SubstringMatcher
+from rate_table import RateTable
+from bisect import bisect_left, bisect_right
+from itertools import chain, islice, repeat
+from operator import itemgetter
 from datetime import datetime
 from prettytable import PrettyTable, ALL
-from statistics import mean
+from fractions import Fraction
 from openpyxl import Workbook
 from openpyxl.styles import Font, Side, Border
 import matplotlib.pyplot as plt
@@ -34,8 +50,7 @@ dict_parameter = {'Название': lambda x, parameter: x.name == parameter,
                   'Идентификатор валюты оклада': lambda x, parameter: dict_currency[x.salary.salary_currency] == parameter,
                   'Оклад': lambda x, parameter: x.salary.salary_from <= int(parameter) <= x.salary.salary_to,
                   'Название региона': lambda x, parameter: x.area == parameter,
-                  'Дата публикации вакансии': lambda x, parameter:
-                  datetime.strptime(x.published_at, '%Y-%m-%dT%H:%M:%S%z').strftime('%d.%m.%Y') == parameter}
+                  'Дата публикации вакансии': lambda x, parameter: x.published_date == parameter}
 dict_sort = {'Название': lambda x: x.name,
                   'Описание': lambda x: x.descr,
                   'Навыки': lambda x: x.skills.count('\n'),
@@ -44,7 +59,14 @@ dict_sort = {'Название': lambda x: x.name,
                   'Компания': lambda x: x.employer,
                   'Оклад': lambda x: x.salary.average_salary,
                   'Название региона': lambda x: x.area,
-                  'Дата публикации вакансии': lambda x: x.published_at}
+                  'Дата публикации вакансии': lambda x: x.published}
+currency_to_rub = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13,
+                   "RUR": 1, "UAH": 1.64, "USD": 60.66, "UZS": 0.0055}
+rate_table = None
+published_days = {}
+html_tag = re.compile(r"<[^>]*>")
+tag_free_columns = {'experience_id', 'premium', 'salary_from', 'salary_to', 'salary_gross', 'salary_currency',
+                    'published_at'}
 
 #Вакансии
 
@@ -68,13 +90,152 @@ def find_skills(x, parameter):
     return True
 
 
+def parse_range(parameter, convert=int):
+    """
+    Разбирает диапазон вида 'от - до'. Одно значение считается диапазоном из одного значения
+
+    Args:
+        parameter (str): Диапазон, введенный пользователем
+        convert (function): Функция, переводящая границу диапазона в сравнимое значение
+
+    Returns:
+        tuple: Нижняя и верхняя граница диапазона
+    """
+    bounds = re.fullmatch(r'\s*(.+?)\s*-\s*(.+?)\s*', parameter)
+    if bounds is None:
+        return convert(parameter.strip()), convert(parameter.strip())
+    return convert(bounds[1]), convert(bounds[2])
+
+
+def set_rate_table(table):
+    """
+    Задает таблицу курсов валют по месяцам, по которой зарплаты переводятся в рубли вместо currency_to_rub.
+    Кеши разобранных файлов ведутся отдельно для каждой таблицы курсов
+
+    Args:
+        table (RateTable): Таблица курсов, None - постоянные курсы currency_to_rub
+    """
+    global rate_table
+    rate_table = table
+
+
+def load_rate_table(file_name='currency.csv'):
+    """
+    Загружает таблицу курсов из файла и задает ее функцией set_rate_table. При запуске программы таблица
+    загружается, только если файл курсов передан первым аргументом: python full.py currency.csv
+
+    Args:
+        file_name (str): Файл курсов со столбцом date в формате 'гггг-мм' и столбцом на каждую валюту
+
+    Returns:
+        RateTable: Таблица курсов
+    """
+    set_rate_table(RateTable.from_csv(file_name))
+    return rate_table
+
+
+def get_rate(currency, published_at=None):
+    """
+    Args:
+        currency (str): Код валюты
+        published_at (str): Дата публикации вакансии в формате '%Y-%m-%dT%H:%M:%S%z'
+
+    Returns:
+        float: Курс к рублю из rate_table на месяц публикации, если он есть, иначе из currency_to_rub
+    """
+    if rate_table is not None and published_at is not None:
+        rate = rate_table.get_rate(currency, published_at)
+        if rate == rate:
+            return rate
+    return currency_to_rub[currency]
+
+
+def get_cache_kind(kind):
+    """
+    Args:
+        kind (str): Вид данных кеша
+
+    Returns:
+        str: Вид данных с ключом таблицы курсов, если она задана, так как от нее зависят зарплаты в кеше
+    """
+    return kind if rate_table is None else f'{kind}-{rate_table.key}'
+
+
+def date_key(date):
+    """
+    Переводит дату в формате '%d.%m.%Y' в строку '%Y%m%d', которую можно сравнивать как дату
+
+    Args:
+        date (str): Дата в формате '%d.%m.%Y'
+
+    Returns:
+        str: Дата в формате '%Y%m%d'
+    """
+    return date[6:] + date[3:5] + date[:2]
+
+
+def parse_published_at(value):
+    """
+    Разбирает дату и время публикации в формате '%Y-%m-%dT%H:%M:%S%z' без вызова strptime для каждой строки.
+    Начало дня запоминается в published_days по дате и часовому поясу, так как даты публикации многократно
+    повторяются с точностью до дня
+
+    Args:
+        value (str): Дата и время публикации
+
+    Returns:
+        tuple: Время публикации в секундах от начала эпохи, дата в формате '%d.%m.%Y', год
+    """
+    key = value[:10] + value[19:]
+    day = published_days.get(key)
+    if day is None:
+        start = datetime.strptime(key[:10] + 'T00:00:00' + key[10:], '%Y-%m-%dT%H:%M:%S%z')
+        day = published_days[key] = (start.timestamp(), start.strftime('%d.%m.%Y'), start.year)
+    return day[0] + int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19]), day[1], day[2]
+
+
+def get_rows(file_name):
+    """
+    Построчно читает файл и отдает только строки, содержащие полную информацию, не загружая весь файл в память
+
+    Args:
+        file_name (str): Имя файла, введного пользователем
+
+    Yields:
+        list: Строка csv файла
+    """
+    with open(file_name, encoding='utf_8_sig') as file_csv:
+        for row in csv.reader(file_csv):
+            if '' not in row:
+                yield row
+
+
+def get_range_rows(file_name, start, end):
+    """
+    Читает часть файла от start до end байт, полученную из split_csv, и отдает только строки,
+    содержащие полную информацию
+
+    Args:
+        file_name (str): Имя файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+
+    Yields:
+        list: Строка csv файла
+    """
+    for row in read_range(file_name, start, end):
+        if '' not in row:
+            yield row
+
+
 class DataSet:
     """
     Класс для представления данных csv файла
 
     Attributes:
         file_name (list): Список заголовков столбцов
-        vacancies (list): Список объектов Vacancy
+        vacancies (VacancyTable): Вакансии, хранящиеся по столбцам. Разобранная таблица кешируется в папке
+            '<файл>.cache' рядом с файлом, см. DatasetCache
     """
 
     def __init__(self, file_name):
@@ -85,51 +246,94 @@ class DataSet:
             file_name (str): Имя файла, введного пользователем
         """
         self.error = False
+        cache = DatasetCache(file_name, get_cache_kind('vacancies'), VacancyTable)
+        if cache.is_valid():
+            self.file_name = cache.meta['header']
+            self.vacancies = cache.load()[0]
+            return
         reader = self.csv_reader(file_name)
         if reader is None:
             self.error = True
             return
         self.file_name = reader[0]
-        self.vacancies = self.csv_filer(reader[1])
+        self.vacancies = self.csv_filer(reader[1], self.file_name)
+        cache.save([self.vacancies], header=self.file_name)
 
     @staticmethod
     def csv_reader(file_name):
         """
-        Читает файл, получает заголовки столбцов и вакансии, содуржащие полную информацию
+        Читает файл, получает заголовки столбцов и вакансии, содуржащие полную информацию.
+        Вакансии не загружаются в память целиком, а читаются по мере обращения к ним
 
         Args:
             file_name (str) : Имя файла, введного пользователем
 
         Returns:
-            tuple: Список заголовков столбцов, список вакансий
+            tuple: Список заголовков столбцов, итератор по вакансиям
         """
-        file_csv = open(file_name, encoding='utf_8_sig')
-        reader_csv = csv.reader(file_csv)
-        list_data = list(filter(lambda x: '' not in x, reader_csv))
-        if len(list_data) == 0:
+        rows = get_rows(file_name)
+        header = next(rows, None)
+        if header is None:
             return print('Пустой файл')
-        if len(list_data[1:]) == 0:
+        first_row = next(rows, None)
+        if first_row is None:
             return print('Нет данных')
-        return list_data[0], list_data[1:]
+        return header, chain([first_row], rows)
+
+    @staticmethod
+    def clean_column(column, skip_tags=False, skip_spaces=False):
+        """
+        Очищает целый столбец пачки вакансий: удаляет html теги и лишние пробельные символы
+
+        Args:
+            column (tuple): Значения одного столбца
+            skip_tags (bool): Столбец заведомо не содержит html тегов
+            skip_spaces (bool): Не схлопывать пробельные символы (столбец навыков)
+
+        Returns:
+            list: Очищенные значения столбца
+        """
+        if not skip_tags:
+            column = [html_tag.sub("", value) if '<' in value else value for value in column]
+        if not skip_spaces:
+            column = [" ".join(value.split()) for value in column]
+        return column
 
     @staticmethod
-    def csv_filer(reader):
+    def clean_rows(reader, header=None, batch_size=1000):
         """
+        Очищает вакансии пачками по batch_size строк: пачка транспонируется в столбцы, каждый столбец
+        обрабатывается целиком заранее скомпилированным шаблоном. Столбцы из tag_free_columns не проверяются
+        на html теги. У навыков (столбец 2) сохраняются переносы строк
+
         Args:
-            reader (str): Список вакансий
+            reader (iterable): Вакансии в виде списков строк
+            header (list): Заголовки столбцов, None если неизвестны
+            batch_size (int): Число строк в одной пачке
+
+        Yields:
+            tuple: Очищенная вакансия
+        """
+        reader = iter(reader)
+        batch = list(islice(reader, batch_size))
+        while batch:
+            columns = []
+            for i, column in enumerate(zip(*batch)):
+                columns.append(DataSet.clean_column(column, header is not None and header[i] in tag_free_columns, i == 2))
+            yield from zip(*columns)
+            batch = list(islice(reader, batch_size))
+
+    @staticmethod
+    def csv_filer(reader, header=None):
+        """
+        Args:
+            reader (iterable): Вакансии в виде списков строк
+            header (list): Заголовки столбцов, None если неизвестны
 
         Returns:
-            list: Список объектов Vacancy
+            VacancyTable: Вакансии без html тегов
         """
-        vacancies = []
-        for line in reader:
-            vacancy = []
-            for i in range(0, len(line)):
-                value = re.sub(re.compile(r"<[^>]*>"), "", line[i])
-                value = " ".join(value.split()) if i != 2 else " ".join(value.split(' '))
-                vacancy.append(value)
-            vacancies.append(Vacancy(vacancy))
-        return vacancies
+        return VacancyTable(DataSet.clean_rows(reader, header))
 
 
 class Salary:
@@ -137,27 +341,27 @@ class Salary:
     Класс для предсталения зарплаты
 
     Attributes:
-        __currency_to_rub (dict): Неизменяемый словарь курсов валют
         salary_from (int): Нижняя граница зарплаты
         salary_to (int): Верхняя граница зарплаты
         salary_gross (str): Указывает, включен ли в зарплату вычет налогов
         salary_currency (str): Указывает на курс валюты
         average_salary (float): Средняя зарплата
     """
-    def __init__(self, data):
+    __slots__ = ('salary_from', 'salary_to', 'salary_gross', 'salary_currency', 'average_salary')
+
+    def __init__(self, data, published_at=None):
         """
         Инициализирует объект Salary
 
         Args:
             data (list): Список, состоит из всех значений, необходимых для инициализации объекта Salary
+            published_at (str): Дата публикации, по месяцу которой берется курс из rate_table
         """
-        self.__currency_to_rub = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13,
-                       "RUR": 1, "UAH": 1.64, "USD": 60.66, "UZS": 0.0055}
         self.salary_from = int(float(data[0]))
         self.salary_to = int(float(data[1]))
         self.salary_gross = data[2]
         self.salary_currency = data[3]
-        self.average_salary = (self.salary_to + self.salary_from) / 2 * self.__currency_to_rub[data[3]]
+        self.average_salary = (self.salary_to + self.salary_from) / 2 * get_rate(data[3], published_at)
 
     def to_string(self):
         """
@@ -186,6 +390,8 @@ class Vacancy:
         area (str): Город
         published_at (str): Дата и время публикации
     """
+    __slots__ = ('name', 'descr', 'skills', 'exp', 'premium', 'employer', 'salary', 'area', 'published_at')
+
     def __init__(self, data):
         """
         Инициализирует объект Vacancy
@@ -193,27 +399,806 @@ class Vacancy:
         Args:
             data (list): Список, состоит из всех значений, необходимых для инициализации объекта Vacancy
         """
-        self.name = data[0]
-        self.descr = data[1]
-        self.skills = data[2]
-        self.exp = data[3]
-        self.premium = data[4]
-        self.employer = data[5]
-        self.salary = Salary(data[6:10])
-        self.area = data[10]
-        self.published_at = data[11]
+        self.name = data[0]
+        self.descr = data[1]
+        self.skills = data[2]
+        self.exp = data[3]
+        self.premium = data[4]
+        self.employer = data[5]
+        self.salary = Salary(data[6:10], data[11])
+        self.area = data[10]
+        self.published_at = data[11]
+
+    published = property(lambda self: parse_published_at(self.published_at)[0])
+    published_date = property(lambda self: parse_published_at(self.published_at)[1])
+
+    def translate_vacancy(self):
+        """
+        Переводит объект Salary в строку, каждый атрибут переводится по собственному правилу
+
+        Returns
+            list: Отформатированные атрибуты объекта Vacancy в виде списка
+        """
+        cut_text = lambda x: x[:100] + '...' if len(x) > 100 else x
+        return [self.name, cut_text(self.descr), cut_text(self.skills), dict_experience[self.exp],
+                dict_bool[self.premium], self.employer, self.salary.to_string(), self.area, self.published_date]
+
+
+class Category:
+    """
+    Словарь значений категориального столбца: каждое значение хранится один раз, в столбце хранится его код
+
+    Attributes:
+        values (list): Значения, индекс значения - его код
+        codes (dict): Словарь, key - значение, value - код
+    """
+    __slots__ = ('values', 'codes')
+
+    def __init__(self, values=()):
+        """
+        Args:
+            values (iterable): Уже известные значения в порядке их кодов
+        """
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def get_code(self, value):
+        """
+        Возвращает код значения, добавляя значение в словарь, если его там еще нет
+
+        Args:
+            value (str): Значение столбца
+
+        Returns:
+            int: Код значения
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ColumnTable:
+    """
+    Базовый класс таблицы, хранящей данные по столбцам. Вид каждого столбца задается в columns: 'str' - список
+    строк, 'category' - коды Category в массиве, иначе - код типа элементов array. Строки добавляет метод append
+    наследника, он есть только у таблиц в памяти: таблица из from_columns, отображенная в память, только читается
+
+    Attributes:
+        categories (dict): Словарь, key - название категориального столбца, value - Category
+    """
+    columns = {}
+
+    def __init__(self, rows=()):
+        """
+        Args:
+            rows (iterable): Строки таблицы в виде списков строк
+        """
+        self.categories = {}
+        for name, kind in self.columns.items():
+            if kind == 'str':
+                setattr(self, name, [])
+            elif kind == 'category':
+                setattr(self, name, array('I'))
+                self.categories[name] = Category()
+            else:
+                setattr(self, name, array(kind))
+        for row in rows:
+            self.append(row)
+
+    @classmethod
+    def from_columns(cls, columns, categories):
+        """
+        Создает таблицу из готовых столбцов, например отображенных в память из кеша
+
+        Args:
+            columns (dict): key - название столбца, value - столбец
+            categories (dict): key - название категориального столбца, value - список значений
+
+        Returns:
+            ColumnTable: Таблица
+        """
+        table = cls()
+        for name, column in columns.items():
+            setattr(table, name, column)
+        table.categories = {name: Category(values) for name, values in categories.items()}
+        return table
+
+    def get_value(self, column, index):
+        """
+        Возвращает значение категориального столбца по номеру строки
+
+        Args:
+            column (str): Название категориального столбца
+            index (int): Номер строки
+
+        Returns:
+            str: Значение
+        """
+        return self.categories[column].values[getattr(self, column)[index]]
+
+    def __len__(self):
+        return len(getattr(self, next(iter(self.columns))))
+
+
+class StringColumn:
+    """
+    Строковый столбец, отображенный в память: строки в кодировке utf-8 записаны подряд, offsets хранит
+    границы строк. Строка декодируется только при обращении к ней
+
+    Attributes:
+        data (memoryview): Строки столбца
+        offsets (memoryview): Начало каждой строки и конец последней
+    """
+    __slots__ = ('data', 'offsets')
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __getitem__(self, index):
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class DatasetCache:
+    """
+    Кеш разобранного csv файла в папке '<файл>.cache/<вид данных>' рядом с файлом. Данные хранятся частями,
+    каждая часть - таблица ColumnTable, каждый столбец которой записан в двоичный файл и при загрузке отображается
+    в память через mmap. Кеш действителен, пока у csv файла не изменились размер и время изменения, если изменилось
+    только время изменения - пока не изменился хеш содержимого
+
+    Attributes:
+        file_name (str): Имя csv файла
+        path (str): Папка кеша
+        table_class (type): Класс таблиц кеша
+        meta (dict): Описание кеша: ключ файла, части таблицы и дополнительные данные, None если кеша нет
+    """
+    version = 1
+
+    def __init__(self, file_name, kind, table_class):
+        """
+        Args:
+            file_name (str): Имя csv файла
+            kind (str): Вид данных, для каждого вида ведется свой кеш
+            table_class (type): Класс таблиц кеша
+        """
+        self.file_name = file_name
+        self.path = os.path.join(file_name + '.cache', kind)
+        self.table_class = table_class
+        self.meta = None
+
+    def get_file_key(self):
+        """
+        Returns:
+            tuple: Размер и время изменения csv файла
+        """
+        stat = os.stat(self.file_name)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get_hash(self):
+        """
+        Returns:
+            str: Хеш содержимого csv файла
+        """
+        file_hash = hashlib.blake2b()
+        with open(self.file_name, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    def is_valid(self):
+        """
+        Проверяет, что кеш есть и соответствует текущему содержимому csv файла
+
+        Returns:
+            bool: Можно ли использовать кеш
+        """
+        try:
+            with open(os.path.join(self.path, 'meta.json'), encoding='utf-8') as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if meta.get('version') != self.version or meta.get('columns') != self.table_class.columns:
+            return False
+        try:
+            size, mtime = self.get_file_key()
+        except OSError:
+            return False
+        if meta['size'] != size:
+            return False
+        if meta['mtime'] != mtime:
+            if meta['hash'] != self.get_hash():
+                return False
+            meta['mtime'] = mtime
+            try:
+                self.write_meta(meta)
+            except OSError:
+                pass
+        self.meta = meta
+        return True
+
+    def load(self):
+        """
+        Отображает в память все части кеша
+
+        Returns:
+            list: Таблицы table_class
+        """
+        return [self.load_part(part) for part in self.meta['parts']]
+
+    def load_part(self, part):
+        """
+        Args:
+            part (dict): Описание части: папка, число строк и значения категориальных столбцов
+
+        Returns:
+            ColumnTable: Таблица, столбцы которой отображены в память
+        """
+        columns = {}
+        for name, kind in self.table_class.columns.items():
+            path = os.path.join(self.path, part['name'], name)
+            if kind == 'str':
+                columns[name] = StringColumn(self.map_file(path + '.bin'), self.map_file(path + '.idx').cast('q'))
+            else:
+                columns[name] = self.map_file(path + '.bin').cast('I' if kind == 'category' else kind)
+        return self.table_class.from_columns(columns, part['categories'])
+
+    @staticmethod
+    def map_file(file_name):
+        """
+        Args:
+            file_name (str): Имя двоичного файла
+
+        Returns:
+            memoryview: Содержимое файла, отображенное в память
+        """
+        with open(file_name, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(b'')
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def clear(self):
+        """
+        Делает кеш недействительным, удаляя его описание
+        """
+        self.meta = {'version': self.version, 'columns': self.table_class.columns, 'parts': []}
+        if os.path.exists(os.path.join(self.path, 'meta.json')):
+            os.remove(os.path.join(self.path, 'meta.json'))
+
+    def save_part(self, table):
+        """
+        Записывает таблицу как очередную часть кеша
+
+        Args:
+            table (ColumnTable): Таблица table_class
+        """
+        self.meta['parts'].append(self.write_part(table, len(self.meta['parts'])))
+
+    def write_part(self, table, number):
+        """
+        Записывает файлы части кеша, не изменяя описание кеша. Части могут записываться параллельно
+        в разных процессах
+
+        Args:
+            table (ColumnTable): Таблица table_class
+            number (int): Номер части
+
+        Returns:
+            dict: Описание части для meta['parts']
+        """
+        part = {'name': f'part-{number:05d}', 'length': len(table),
+                'categories': {name: category.values for name, category in table.categories.items()}}
+        os.makedirs(os.path.join(self.path, part['name']), exist_ok=True)
+        for name, kind in self.table_class.columns.items():
+            path = os.path.join(self.path, part['name'], name)
+            with open(path + '.bin', 'wb') as file:
+                if kind != 'str':
+                    getattr(table, name).tofile(file)
+                    continue
+                offsets = array('q', [0])
+                for value in getattr(table, name):
+                    offsets.append(offsets[-1] + file.write(value.encode('utf-8')))
+            if kind == 'str':
+                with open(path + '.idx', 'wb') as file:
+                    offsets.tofile(file)
+        return part
+
+    def finish(self, file_key, **extra):
+        """
+        Записывает описание кеша, после чего кеш становится действительным. Если csv файл изменился,
+        пока он читался, описание не записывается
+
+        Args:
+            file_key (tuple): Размер и время изменения csv файла до начала чтения
+            extra: Дополнительные данные, например заголовки столбцов
+        """
+        if self.get_file_key() != file_key:
+            return
+        self.meta.update(extra, size=file_key[0], mtime=file_key[1], hash=self.get_hash())
+        self.write_meta(self.meta)
+        self.remove_parts(len(self.meta['parts']))
+
+    def remove_parts(self, count):
+        """
+        Удаляет папки частей с номерами от count, оставшиеся от прошлой записи кеша с большим числом частей
+
+        Args:
+            count (int): Число частей текущего кеша
+        """
+        for name in os.listdir(self.path):
+            if re.fullmatch(r'part-\d{5}', name) and int(name[5:]) >= count:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def write_meta(self, meta):
+        """
+        Args:
+            meta (dict): Описание кеша
+        """
+        with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(meta, file, ensure_ascii=False)
+
+    def save(self, tables, **extra):
+        """
+        Заменяет содержимое кеша таблицами. Ошибки записи не мешают работе программы, кеш просто остается
+        недействительным
+
+        Args:
+            tables (list): Таблицы table_class
+            extra: Дополнительные данные, например заголовки столбцов
+        """
+        try:
+            file_key = self.get_file_key()
+            self.clear()
+            for table in tables:
+                self.save_part(table)
+            self.finish(file_key, **extra)
+        except OSError:
+            pass
+
+class VacancyTable(ColumnTable):
+    """
+    Класс для хранения вакансий по столбцам. Числа хранятся в типизированных массивах, повторяющиеся строки
+    (опыт работы, премиум, валюта, вычет налогов, город, дата публикации) - в виде кодов Category. Строки таблицы доступны
+    через легкие представления VacancyView, которые поддерживают тот же интерфейс, что и Vacancy
+
+    Attributes:
+        descr (list or StringColumn): Описания специальностей
+        skills (list or StringColumn): Требуемые навыки
+        employer (list or StringColumn): Названия компаний
+        published_at (list or StringColumn): Даты и время публикации
+        salary_from (array): Нижние границы зарплат
+        salary_to (array): Верхние границы зарплат
+        average_salary (array): Средние зарплаты в рублях
+        published (array): Время публикации в секундах от начала эпохи
+        name, exp, premium, salary_gross, salary_currency, area, published_date (array): Коды категориальных
+            столбцов
+        categories (dict): Словарь, key - название категориального столбца, value - Category
+        index (VacancyIndex): Индексы для фильтрации таблицы
+    """
+    columns = {'name': 'category', 'descr': 'str', 'skills': 'str', 'exp': 'category', 'premium': 'category',
+               'employer': 'str', 'salary_from': 'q', 'salary_to': 'q', 'salary_gross': 'category',
+               'salary_currency': 'category', 'average_salary': 'd', 'area': 'category', 'published_at': 'str',
+               'published': 'd', 'published_date': 'category'}
+
+    def __init__(self, rows=()):
+        """
+        Args:
+            rows (iterable): Вакансии в виде списков строк
+        """
+        self.index = VacancyIndex(self)
+        super().__init__(rows)
+
+    def append(self, data):
+        """
+        Добавляет вакансию в конец таблицы
+
+        Args:
+            data (list): Список, состоит из всех значений, необходимых для инициализации объекта Vacancy
+        """
+        salary_from = int(float(data[6]))
+        salary_to = int(float(data[7]))
+        published, published_date, _ = parse_published_at(data[11])
+        self.name.append(self.categories['name'].get_code(data[0]))
+        self.descr.append(data[1])
+        self.skills.append(data[2])
+        self.exp.append(self.categories['exp'].get_code(data[3]))
+        self.premium.append(self.categories['premium'].get_code(data[4]))
+        self.employer.append(data[5])
+        self.salary_from.append(salary_from)
+        self.salary_to.append(salary_to)
+        self.salary_gross.append(self.categories['salary_gross'].get_code(data[8]))
+        self.salary_currency.append(self.categories['salary_currency'].get_code(data[9]))
+        self.average_salary.append((salary_to + salary_from) / 2 * get_rate(data[9], data[11]))
+        self.area.append(self.categories['area'].get_code(data[10]))
+        self.published_at.append(data[11])
+        self.published.append(published)
+        self.published_date.append(self.categories['published_date'].get_code(published_date))
+
+    def get_category_keys(self, column, translation=None):
+        """
+        Переводит категориальный столбец в числовые ключи сортировки: код каждого значения заменяется местом
+        значения (после перевода) среди всех значений столбца
+
+        Args:
+            column (str): Название категориального столбца
+            translation (function): Перевод значения, None если значение сравнивается как есть
+
+        Returns:
+            array: Ключи сортировки по строкам
+        """
+        values = [x if translation is None else translation(x) for x in self.categories[column].values]
+        places = {value: i for i, value in enumerate(sorted(set(values)))}
+        key_by_code = [places[value] for value in values]
+        return array('l', (key_by_code[code] for code in getattr(self, column)))
+
+    def get_sort_keys(self, column):
+        """
+        Вычисляет ключи сортировки столбца один раз для всех строк, совпадает с dict_sort
+
+        Args:
+            column (str): Столбец сортировки
+
+        Returns:
+            list or array: Ключи сортировки по строкам
+        """
+        if column == 'Навыки':
+            return array('l', (x.count('\n') for x in self.skills))
+        if column == 'Опыт работы':
+            return self.get_category_keys('exp', list(dict_experience.keys()).index)
+        if column == 'Премиум-вакансия':
+            return self.get_category_keys('premium', dict_bool.get)
+        if column == 'Название региона':
+            return self.get_category_keys('area')
+        if column == 'Название':
+            return self.get_category_keys('name')
+        return {'Описание': self.descr, 'Компания': self.employer,
+                'Оклад': self.average_salary, 'Дата публикации вакансии': self.published}[column]
+
+    def filter(self, column, parameter):
+        """
+        Отбирает вакансии, подходящие под одно условие фильтрации
+
+        Args:
+            column (str): Фильтруемый столбец
+            parameter (str): Параметр фильтрации
+
+        Returns:
+            list: Объекты VacancyView в порядке строк таблицы
+        """
+        return Query([[[column, parameter]]]).select(self)
+
+    def __getitem__(self, index):
+        return VacancyView(self, index)
+
+    def __iter__(self):
+        return (VacancyView(self, i) for i in range(len(self)))
+
+
+class SalaryView:
+    """
+    Представление зарплаты строки VacancyTable с интерфейсом Salary
+
+    Attributes:
+        table (VacancyTable): Таблица вакансий
+        index (int): Номер строки
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    salary_from = property(lambda self: self.table.salary_from[self.index])
+    salary_to = property(lambda self: self.table.salary_to[self.index])
+    salary_gross = property(lambda self: self.table.get_value('salary_gross', self.index))
+    salary_currency = property(lambda self: self.table.get_value('salary_currency', self.index))
+    average_salary = property(lambda self: self.table.average_salary[self.index])
+    to_string = Salary.to_string
+
+
+class VacancyView:
+    """
+    Представление строки VacancyTable с интерфейсом Vacancy
+
+    Attributes:
+        table (VacancyTable): Таблица вакансий
+        index (int): Номер строки
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    name = property(lambda self: self.table.get_value('name', self.index))
+    descr = property(lambda self: self.table.descr[self.index])
+    skills = property(lambda self: self.table.skills[self.index])
+    exp = property(lambda self: self.table.get_value('exp', self.index))
+    premium = property(lambda self: self.table.get_value('premium', self.index))
+    employer = property(lambda self: self.table.employer[self.index])
+    salary = property(lambda self: SalaryView(self.table, self.index))
+    area = property(lambda self: self.table.get_value('area', self.index))
+    published_at = property(lambda self: self.table.published_at[self.index])
+    published = property(lambda self: self.table.published[self.index])
+    published_date = property(lambda self: self.table.get_value('published_date', self.index))
+    translate_vacancy = Vacancy.translate_vacancy
+
+
+class VacancyIndex:
+    """
+    Индексы таблицы вакансий. Каждый индекс строится при первом запросе по своему столбцу и используется
+    во всех следующих запросах, поэтому повторная фильтрация не перебирает всю таблицу
+
+    Attributes:
+        table (VacancyTable): Таблица вакансий
+        __hash_indexes (dict): key - столбец, value - словарь, key - значение столбца, value - номера строк
+        __skills_index (dict): Обратный индекс, key - навык, value - множество номеров строк
+        __salary_index (tuple): Номера строк, упорядоченные по нижней и по верхней границе зарплаты, и сами границы
+    """
+    category_columns = {'Название': ('name', None),
+                        'Опыт работы': ('exp', dict_experience),
+                        'Премиум-вакансия': ('premium', dict_bool),
+                        'Идентификатор валюты оклада': ('salary_currency', dict_currency),
+                        'Название региона': ('area', None),
+                        'Дата публикации вакансии': ('published_date', None)}
+    text_columns = {'Компания': 'employer'}
+
+    def __init__(self, table):
+        self.table = table
+        self.__hash_indexes = {}
+        self.__skills_index = None
+        self.__salary_index = None
+
+    def find(self, column, parameter):
+        """
+        Находит номера строк, подходящих под параметр фильтрации
+
+        Args:
+            column (str): Фильтруемый столбец
+            parameter (str): Параметр фильтрации, для оклада и даты публикации может быть диапазоном
+
+        Returns:
+            list or None: Номера строк по возрастанию, None если для столбца нет индекса
+        """
+        if column == 'Навыки':
+            return self.find_skills(parameter)
+        if column == 'Оклад':
+            return self.find_salary(*parse_range(parameter))
+        if column == 'Дата публикации вакансии' and '-' in parameter:
+            return sorted(chain.from_iterable(self.get_date_range(parameter)))
+        if column not in self.category_columns and column not in self.text_columns:
+            return None
+        return self.get_hash_index(column).get(parameter, [])
+
+    def estimate(self, column, parameter):
+        """
+        Оценивает сверху число строк, подходящих под параметр фильтрации, не отбирая сами строки
+
+        Args:
+            column (str): Фильтруемый столбец
+            parameter (str): Параметр фильтрации
+
+        Returns:
+            int or None: Оценка числа строк, None если для столбца нет индекса
+        """
+        if column == 'Навыки':
+            skills_index = self.get_skills_index()
+            return min(len(skills_index.get(skill, ())) for skill in parameter.split(', '))
+        if column == 'Оклад':
+            _, from_end, by_to, to_start = self.get_salary_bounds(*parse_range(parameter))
+            return min(from_end, len(by_to) - to_start)
+        if column == 'Дата публикации вакансии' and '-' in parameter:
+            return sum(len(rows) for rows in self.get_date_range(parameter))
+        if column not in self.category_columns and column not in self.text_columns:
+            return None
+        return len(self.get_hash_index(column).get(parameter, []))
+
+    def get_hash_index(self, column):
+        """
+        Возвращает хеш-индекс столбца, строит его при первом обращении. Для категориальных столбцов строки
+        группируются по кодам, а ключом индекса становится значение в том виде, в котором его вводит пользователь
+
+        Args:
+            column (str): Столбец
+
+        Returns:
+            dict: key - значение столбца, value - номера строк по возрастанию
+        """
+        index = self.__hash_indexes.get(column)
+        if index is not None:
+            return index
+        index = {}
+        if column in self.text_columns:
+            for i, value in enumerate(getattr(self.table, self.text_columns[column])):
+                index.setdefault(value, []).append(i)
+        else:
+            name, translation = self.category_columns[column]
+            rows_by_code = [[] for _ in self.table.categories[name].values]
+            for i, code in enumerate(getattr(self.table, name)):
+                rows_by_code[code].append(i)
+            for value, rows in zip(self.table.categories[name].values, rows_by_code):
+                key = value if translation is None else translation[value]
+                index[key] = sorted(index[key] + rows) if key in index else rows
+        self.__hash_indexes[column] = index
+        return index
+
+    def get_date_range(self, parameter):
+        """
+        Отбирает из хеш-индекса даты публикации дни, попадающие в диапазон
+
+        Args:
+            parameter (str): Диапазон дат в формате '%d.%m.%Y - %d.%m.%Y'
+
+        Returns:
+            list: Списки номеров строк для каждого дня из диапазона
+        """
+        low, high = parse_range(parameter, date_key)
+        index = self.get_hash_index('Дата публикации вакансии')
+        return [rows for date, rows in index.items() if low <= date_key(date) <= high]
+
+    def get_skills_index(self):
+        """
+        Возвращает обратный индекс навыков, строит его при первом обращении
+
+        Returns:
+            dict: key - навык, value - множество номеров строк
+        """
+        if self.__skills_index is None:
+            self.__skills_index = {}
+            for i, skills in enumerate(self.table.skills):
+                for skill in skills.split():
+                    self.__skills_index.setdefault(skill, set()).add(i)
+        return self.__skills_index
+
+    def find_skills(self, parameter):
+        """
+        Находит вакансии, навыки которых содержат все навыки, указанные пользователем, пересечением множеств
+        обратного индекса. Совпадает с find_skills
+
+        Args:
+            parameter (str): Навыки, введенные пользователем
+
+        Returns:
+            list: Номера строк по возрастанию
+        """
+        skills_index = self.get_skills_index()
+        rows_list = sorted((skills_index.get(skill, set()) for skill in parameter.split(', ')), key=len)
+        return sorted(rows_list[0].intersection(*rows_list[1:]))
+
+    def get_salary_bounds(self, low, high):
+        """
+        Бинарным поиском по отсортированным границам зарплат находит вакансии с salary_from <= high
+        (начало by_from) и вакансии с salary_to >= low (конец by_to)
+
+        Args:
+            low (int): Нижняя граница оклада
+            high (int): Верхняя граница оклада
+
+        Returns:
+            tuple: by_from, длина подходящего начала by_from, by_to, начало подходящего конца by_to
+        """
+        if self.__salary_index is None:
+            by_from = sorted(range(len(self.table)), key=self.table.salary_from.__getitem__)
+            by_to = sorted(range(len(self.table)), key=self.table.salary_to.__getitem__)
+            self.__salary_index = (by_from, [self.table.salary_from[i] for i in by_from],
+                                   by_to, [self.table.salary_to[i] for i in by_to])
+        by_from, from_values, by_to, to_values = self.__salary_index
+        return by_from, bisect_right(from_values, high), by_to, bisect_left(to_values, low)
+
+    def find_salary(self, low, high):
+        """
+        Находит вакансии, вилка которых пересекается с диапазоном [low, high]. При low == high это вакансии,
+        у которых salary_from <= low <= salary_to. Перебирается только меньшее из двух множеств кандидатов
+
+        Args:
+            low (int): Нижняя граница оклада
+            high (int): Верхняя граница оклада
+
+        Returns:
+            list: Номера строк по возрастанию
+        """
+        by_from, from_end, by_to, to_start = self.get_salary_bounds(low, high)
+        if from_end <= len(by_to) - to_start:
+            return sorted(i for i in by_from[:from_end] if self.table.salary_to[i] >= low)
+        return sorted(i for i in by_to[to_start:] if self.table.salary_from[i] <= high)
+
+
+class Query:
+    """
+    Составной запрос фильтрации: группы условий, объединенные через ИЛИ, условия внутри группы - через И.
+    Каждое условие заранее переводится в функцию проверки, внутри группы условия упорядочиваются по
+    избирательности: самое избирательное выполняется по индексу, остальные проверяются за один проход
+    по его результату
+
+    Attributes:
+        groups (list): Группы условий, условие - список [столбец, параметр, функция проверки]
+    """
+    def __init__(self, groups):
+        """
+        Args:
+            groups (list): Группы условий, условие - список [столбец, параметр]
+        """
+        self.groups = [[[column, parameter, self.compile(column, parameter)] for column, parameter in group]
+                       for group in groups]
+
+    @staticmethod
+    def compile(column, parameter):
+        """
+        Переводит условие в функцию проверки вакансии, диапазоны разбираются один раз
+
+        Args:
+            column (str): Фильтруемый столбец
+            parameter (str): Параметр фильтрации
+
+        Returns:
+            function: Функция, принимающая вакансию и возвращающая bool
+        """
+        if column == 'Оклад':
+            low, high = parse_range(parameter)
+            return lambda x: x.salary.salary_from <= high and low <= x.salary.salary_to
+        if column == 'Дата публикации вакансии' and '-' in parameter:
+            low, high = parse_range(parameter, date_key)
+            return lambda x: low <= date_key(x.published_date) <= high
+        check = dict_parameter[column]
+        return lambda x: check(x, parameter)
+
+    def match(self, vacancy):
+        """
+        Проверяет вакансию на соответствие запросу
+
+        Args:
+            vacancy (Vacancy): Вакансия
+
+        Returns:
+            bool: Подходит ли вакансия
+        """
+        return any(all(condition[2](vacancy) for condition in group) for group in self.groups)
+
+    def select(self, table):
+        """
+        Отбирает вакансии таблицы, подходящие под запрос
+
+        Args:
+            table (VacancyTable): Таблица вакансий
+
+        Returns:
+            list: Объекты VacancyView в порядке строк таблицы
+        """
+        rows = set()
+        for group in self.groups:
+            rows.update(self.select_group(table, group))
+        return [VacancyView(table, i) for i in sorted(rows)]
 
-    def translate_vacancy(self):
+    @staticmethod
+    def select_group(table, group):
         """
-        Переводит объект Salary в строку, каждый атрибут переводится по собственному правилу
+        Отбирает номера строк, подходящие под все условия группы
 
-        Returns
-            list: Отформатированные атрибуты объекта Vacancy в виде списка
+        Args:
+            table (VacancyTable): Таблица вакансий
+            group (list): Условия группы
+
+        Returns:
+            list: Номера строк
         """
-        cut_text = lambda x: x[:100] + '...' if len(x) > 100 else x
-        return [self.name, cut_text(self.descr), cut_text(self.skills), dict_experience[self.exp],
-                dict_bool[self.premium], self.employer, self.salary.to_string(), self.area,
-                datetime.strptime(self.published_at, '%Y-%m-%dT%H:%M:%S%z').strftime('%d.%m.%Y')]
+        estimates = [table.index.estimate(column, parameter) for column, parameter, _ in group]
+        order = sorted(range(len(group)), key=lambda i: (estimates[i] is None, estimates[i]))
+        if estimates[order[0]] is None:
+            rows = range(len(table))
+        else:
+            rows = table.index.find(group[order[0]][0], group[order[0]][1])
+            order = order[1:]
+        checks = [group[i][2] for i in order]
+        if len(checks) == 0:
+            return rows
+        return [i for i in rows if all(check(VacancyView(table, i)) for check in checks)]
 
 
 class InputConnect:
@@ -223,7 +1208,7 @@ class InputConnect:
     Attributes:
         __valid_params (list): Неизменяемый список корректных столбцов
         error_message (str): Значение, которое напечатается, если какой-то из введеных параметров некорректен
-        filter_param (list or str): list[0] - Фильтруемый столбец, list[1] - Параметр фильтрации, '' если параметр отсутствует
+        filter_param (Query or str): Запрос фильтрации, '' если параметр отсутствует
         sort_param (str): Параметр фильтрации, '' если параметр отсутствует
         is_reverse: (str): Параметр порядка последовательности, введенный пользователем
         borders (list): borders[0] - нижняя граница вывода, borders[1] - верхняя граница выводы
@@ -241,24 +1226,37 @@ class InputConnect:
 
     def format_filter_param(self, param):
         """
-        Проверяет параметр фильтрации на корректность, если он некорректен, меняет значени атрибута error_message
+        Проверяет параметр фильтрации на корректность, если он некорректен, меняет значени атрибута error_message.
+        Параметр может состоять из нескольких условий 'Столбец: значение': условия, разделенные ';', должны
+        выполняться одновременно, группы условий, разделенные '|', объединяются через ИЛИ. Для оклада и даты
+        публикации значение может быть диапазоном 'от - до'
 
         Args:
             param (str): Параметр фильтрации, введенный пользователем
 
         Returns:
-            list or str: list[0] - Фильтруемый столбец, list[1] - Параметр фильтрации, '' если параметр отсутствует
+            Query or str: Запрос фильтрации, '' если параметр отсутствует
         """
         if param == '':
             return param
-        item = param.split(':')
-        if len(item) != 2:
+        groups = []
+        for group in re.split(r'\s*\|\s*', param):
+            conditions = []
+            for condition in re.split(r'\s*;\s*', group):
+                item = condition.split(':')
+                if len(item) != 2:
+                    self.error_message = 'Формат ввода некорректен'
+                    return item
+                if item[0] not in self.__valid_params and item[0] != 'Идентификатор валюты оклада':
+                    self.error_message = 'Параметр поиска некорректен'
+                    return item
+                conditions.append([item[0], item[1].lstrip()])
+            groups.append(conditions)
+        try:
+            return Query(groups)
+        except ValueError:
             self.error_message = 'Формат ввода некорректен'
-        elif item[0] not in self.__valid_params and item[0] != 'Идентификатор валюты оклада':
-            self.error_message = 'Параметр поиска некорректен'
-        else:
-            item[1] = item[1].lstrip()
-        return item
+            return groups
 
     def format_sort_param(self, param):
         """
@@ -290,55 +1288,204 @@ class InputConnect:
             return False
         self.error_message = 'Порядок сортировки задан некорректно'
 
+    def select_rows(self, vacancies):
+        """
+        Отбирает только вакансии, попадающие в диапазон вывода. При сортировке берутся первые end вакансий
+        через heapq за O(n log end) вместо сортировки всего списка, порядок совпадает с sorted. Для VacancyTable
+        сравниваются заранее вычисленные ключи сортировки столбца, а не представления строк
+
+        Args:
+            vacancies (list or VacancyTable): Отфильтрованные вакансии
+
+        Returns:
+            list: Пары (номер строки в таблице, вакансия) для диапазона вывода
+        """
+        start = 0 if len(self.borders) == 0 else self.borders[0]
+        end = len(vacancies) if len(self.borders) != 2 else self.borders[1]
+        positions = range(len(vacancies))[start:end]
+        if self.sort_param == '' or len(positions) == 0:
+            return [(i + 1, vacancies[i]) for i in positions]
+        count = max(positions) + 1
+        table = vacancies if isinstance(vacancies, VacancyTable) else None
+        if table is not None:
+            vacancies, key = range(len(table)), table.get_sort_keys(self.sort_param).__getitem__
+        else:
+            key = dict_sort[self.sort_param]
+        if count == len(vacancies):
+            vacancies = sorted(vacancies, reverse=self.is_reverse, key=key)
+        elif self.is_reverse:
+            vacancies = heapq.nlargest(count, vacancies, key=key)
+        else:
+            vacancies = heapq.nsmallest(count, vacancies, key=key)
+        if table is not None:
+            return [(i + 1, table[vacancies[i]]) for i in positions]
+        return [(i + 1, vacancies[i]) for i in positions]
+
     def print_table(self, vacancies):
         """
-        Печатает таблицу
+        Печатает таблицу, в строки таблицы переводятся только вакансии из диапазона вывода
 
         Args:
-            vacancies (list): Список объектов Vacancy
+            vacancies (iterable): Объекты Vacancy или VacancyTable
 
         Returns:
             Выход из списка, если vacancies пустой
         """
-        if len(self.filter_param) != 0:
-            vacancies = list(filter(lambda x: dict_parameter[self.filter_param[0]](x, self.filter_param[1]), vacancies))
-        if self.sort_param != '':
-            vacancies.sort(reverse=self.is_reverse, key=dict_sort[self.sort_param])
+        if self.filter_param != '' and isinstance(vacancies, VacancyTable):
+            vacancies = self.filter_param.select(vacancies)
+        elif self.filter_param != '':
+            vacancies = list(filter(self.filter_param.match, vacancies))
+        elif not isinstance(vacancies, VacancyTable):
+            vacancies = list(vacancies)
         if len(vacancies) == 0:
             print('Ничего не найдено')
             return
-        vacancies_arr = [x.translate_vacancy() for x in vacancies]
 
         table = PrettyTable()
         table.field_names = ["№"] + self.__valid_params
         table.align = 'l'
         table.max_width = 20
         table.hrules = ALL
-        length = len(vacancies_arr)
-        for i in range(0, length):
-            table.add_row([i + 1] + vacancies_arr[i])
-        print(table.get_string(start=0 if len(self.borders) == 0 else self.borders[0],
-                               end=len(vacancies) if len(self.borders) != 2 else self.borders[1],
-                               fields=['№'] + (self.columns if self.columns[0] != '' else self.__valid_params)))
+        for number, vacancy in self.select_rows(vacancies):
+            table.add_row([number] + vacancy.translate_vacancy())
+        print(table.get_string(fields=['№'] + (self.columns if self.columns[0] != '' else self.__valid_params)))
 
 # Статистика
 
 
+class SalaryStat:
+    """
+    Накопленная статистика зарплат по одному ключу, занимает память, не зависящую от числа зарплат.
+    Сумма хранится точно в виде неперекрывающихся частичных сумм (алгоритм Шевчука), поэтому средняя
+    совпадает со statistics.mean по тем же зарплатам
+
+    Attributes:
+        count (int): Число зарплат
+        partials (list): Частичные суммы, в сумме точно равные сумме зарплат
+        min (float): Минимальная зарплата
+        max (float): Максимальная зарплата
+        welford_mean (float): Средняя по Уэлфорду, None если дисперсия не считается
+        m2 (float): Сумма квадратов отклонений от средней по Уэлфорду
+    """
+    __slots__ = ('count', 'partials', 'min', 'max', 'welford_mean', 'm2')
+
+    def __init__(self, with_variance=False):
+        """
+        Args:
+            with_variance (bool): Считать ли дисперсию
+        """
+        self.count = 0
+        self.partials = []
+        self.min = None
+        self.max = None
+        self.welford_mean = 0.0 if with_variance else None
+        self.m2 = 0.0
+
+    def add(self, salary):
+        """
+        Args:
+            salary (float): зарплата
+        """
+        self.add_to_sum(salary)
+        self.count += 1
+        if self.min is None or salary < self.min:
+            self.min = salary
+        if self.max is None or salary > self.max:
+            self.max = salary
+        if self.welford_mean is not None:
+            delta = salary - self.welford_mean
+            self.welford_mean += delta / self.count
+            self.m2 += delta * (salary - self.welford_mean)
+
+    def add_to_sum(self, x):
+        """
+        Точно добавляет число к частичным суммам
+
+        Args:
+            x (float): Слагаемое
+        """
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            high = x + y
+            low = y - (high - x)
+            if low:
+                partials[i] = low
+                i += 1
+            x = high
+        partials[i:] = [x]
+
+    def merge(self, other):
+        """
+        Добавляет статистику по другой группе зарплат
+
+        Args:
+            other (SalaryStat): Статистика по другой группе зарплат
+        """
+        if other.count == 0:
+            return
+        for x in other.partials:
+            self.add_to_sum(x)
+        if self.count == 0:
+            self.min, self.max = other.min, other.max
+        else:
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        if self.welford_mean is not None:
+            count = self.count + other.count
+            delta = other.welford_mean - self.welford_mean
+            self.welford_mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count += other.count
+
+    def get_sum(self):
+        """
+        Returns:
+            Fraction: Точная сумма зарплат
+        """
+        return sum(map(Fraction, self.partials), Fraction(0))
+
+    def get_mean(self):
+        """
+        Returns:
+            float: Средняя зарплата, округленная так же, как в statistics.mean
+        """
+        return float(self.get_sum() / self.count)
+
+    def get_variance(self):
+        """
+        Returns:
+            float: Дисперсия зарплат, None если дисперсия не считается
+        """
+        if self.welford_mean is None or self.count == 0:
+            return None
+        return self.m2 / self.count
+
+
 class SalaryDict:
     """
-    Класс для хранения информация о статистике по зарплате
+    Класс для хранения информация о статистике по зарплате. Зарплаты не хранятся, по каждому ключу
+    накапливается SalaryStat, средние запоминаются до добавления новой зарплаты
 
     Attributes:
-        salary_dict (dict): Словарь, key - год или город (str), value - список зарплат (list)
-        __average_salary_dict (dict): Неизменяемый словарь, key - год или город (str), value - средняя зарплата (int)
+        salary_dict (dict): Словарь, key - год или город (str), value - статистика зарплат (SalaryStat)
+        with_variance (bool): Считать ли дисперсию зарплат
+        __average_salary_dict (dict): Неизменяемый словарь, key - год или город (str), value - средняя зарплата (int),
+            None если средние нужно пересчитать
     """
-    def __init__(self):
+    def __init__(self, with_variance=False):
+        """
+        Args:
+            with_variance (bool): Считать ли дисперсию зарплат
+        """
         self.salary_dict = {}
-        self.__average_salary_dict = {}
+        self.with_variance = with_variance
+        self.__average_salary_dict = None
 
     def add_salary(self, key, salary):
         """
-        Добавляет зарплату в список зарплат в salary_dict по ключю
+        Добавляет зарплату в статистику зарплат в salary_dict по ключю
 
         Args:
             key (str): ключ salary_dict, год или город
@@ -347,38 +1494,67 @@ class SalaryDict:
         Returns:
             None
         """
-        if self.salary_dict.get(key) is None:
-            self.salary_dict[key] = []
-        return self.salary_dict[key].append(salary)
+        stat = self.salary_dict.get(key)
+        if stat is None:
+            stat = self.salary_dict[key] = SalaryStat(self.with_variance)
+        self.__average_salary_dict = None
+        return stat.add(salary)
+
+    def merge(self, other):
+        """
+        Добавляет статистику зарплат другого SalaryDict, новые ключи добавляются в порядке other
+
+        Args:
+            other (SalaryDict): Статистика по другой части вакансий
+
+        Returns:
+            None
+        """
+        for key, value in other.salary_dict.items():
+            self.add_stat(key, value)
+        return
+
+    def add_stat(self, key, stat):
+        """
+        Добавляет статистику группы зарплат в salary_dict по ключю
+
+        Args:
+            key (str): ключ salary_dict, год или город
+            stat (SalaryStat): статистика группы зарплат
+
+        Returns:
+            None
+        """
+        value = self.salary_dict.get(key)
+        if value is None:
+            value = self.salary_dict[key] = SalaryStat(self.with_variance)
+        self.__average_salary_dict = None
+        return value.merge(stat)
 
     def get_average_salary(self):
         """
-        Находит среднюю зарплату по каждому ключу в salary_dict и добавляет ее в __average_salary_dict по тому же ключу
+        Находит среднюю зарплату по каждому ключу в salary_dict и добавляет ее в __average_salary_dict по тому же ключу.
+        Пока не добавлена новая зарплата, повторно не пересчитывается
 
         Returns:
             dict: __average_salary_dict
         """
-        for key, value in self.salary_dict.items():
-            self.__average_salary_dict[key] = int(mean(value))
+        if self.__average_salary_dict is None:
+            self.__average_salary_dict = {key: int(value.get_mean()) for key, value in self.salary_dict.items()}
         return self.__average_salary_dict
 
-    def top_salary(self, big_cities):
+    def top_salary(self, big_cities, n=10):
         """
-        Находит до 10 самых крупных средних зарплат по городам, которые есть в big_cities
+        Находит до n самых крупных средних зарплат по городам, которые есть в big_cities
 
         Args:
-            big_cities (list): Список городов число вакансий в которых больше 1% от общего числа вакансий
+            big_cities (set): Города число вакансий в которых больше 1% от общего числа вакансий
+            n (int): Число городов
 
         Returns:
-            dict: Словарь отсортированный по средним зарплатам для городов, длинной до 10 элементов
+            dict: Словарь отсортированный по средним зарплатам для городов, длинной до n элементов
         """
-        self.get_average_salary()
-        sorted_dict = dict(sorted(self.__average_salary_dict.items(), key=lambda x: x[1], reverse=True))
-        big_salary_dict = {}
-        for key, value in sorted_dict.items():
-            if key in big_cities:
-                big_salary_dict[key] = value
-        return {x: big_salary_dict[x] for x in list(big_salary_dict)[:10]}
+        return top_n(self.get_average_salary().items(), n, set(big_cities))
 
 
 class CountDict:
@@ -388,34 +1564,54 @@ class CountDict:
     Attributes:
         length (int): Общее число всех вакансий
         count_dict (dict): Словарь, key - год или город (str), value - число вакансий
-        big_cities (list): Список городов число вакансий в которых больше 1% от общего числа вакансий
+        big_cities (set): Города число вакансий в которых больше 1% от общего числа вакансий
         top_proportion_dict (dict): Словарь отсортированный по числу вакансий для городов, длинной до 10 элементов
     """
     def __init__(self):
         self.length = 0
         self.count_dict = {}
-        self.big_cities = []
+        self.big_cities = set()
         self.top_proportion_dict = {}
 
-    def add(self, key):
+    def add(self, key, count=1):
         """
-        Увеличить число вакансий в count_dict на 1 по ключу
+        Увеличить число вакансий в count_dict на count по ключу
 
         Args:
             key (str): ключ count_dict год или город
+            count (int): число вакансий
 
         Returns:
             None
         """
         if self.count_dict.get(key) is None:
             self.count_dict[key] = 0
-        self.count_dict[key] += 1
-        self.length += 1
+        self.count_dict[key] += count
+        self.length += count
+        return
+
+    def merge(self, other):
+        """
+        Добавляет число вакансий другого CountDict, новые ключи добавляются в порядке other
+
+        Args:
+            other (CountDict): Статистика по другой части вакансий
+
+        Returns:
+            None
+        """
+        for key, value in other.count_dict.items():
+            self.count_dict[key] = self.count_dict.get(key, 0) + value
+        self.length += other.length
         return
 
-    def get_proportion(self):
+    def get_proportion(self, threshold=0.01, n=10):
         """
-        Словарь отсортированный по числу вакансий для городов, длинной до 10 элементов
+        Находит города, доля вакансий в которых не меньше threshold, и до n городов с наибольшей долей вакансий
+
+        Args:
+            threshold (float): Минимальная доля вакансий крупного города
+            n (int): Число городов в top_proportion_dict
 
         Returns:
             None
@@ -423,11 +1619,10 @@ class CountDict:
         proportion_dict = {}
         for key, value in self.count_dict.items():
             proportion = value / self.length
-            if proportion >= 0.01:
-                self.big_cities.append(key)
+            if proportion >= threshold:
+                self.big_cities.add(key)
                 proportion_dict[key] = round(proportion, 4)
-        sorted_dict = dict(sorted(proportion_dict.items(), key=lambda x: x[1], reverse=True))
-        self.top_proportion_dict = {x: sorted_dict[x] for x in list(sorted_dict)[:10]}
+        self.top_proportion_dict = top_n(proportion_dict.items(), n)
         return
 
 
@@ -436,12 +1631,13 @@ class VacancyForStatistics:
     Класс представляет информацию о вакансиях, необходимую для статистики
 
     Attributes:
-        __dict_currency (dict): Неизменяемый словарь, представляет курс валют
         job (str): Название профессии
         salary (int): Средняя зарплата, с учетом курса валюты
         city (str): Город
         year (str): Год
     """
+    __slots__ = ('job', 'salary', 'city', 'year')
+
     def __init__(self, data):
         """
         Args:
@@ -449,12 +1645,10 @@ class VacancyForStatistics:
         """
         if len(data) != 6:
             data = [data[0], data[6], data[7], data[9], data[10], data[11]]
-        self.__dict_currency = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13,
-                   "RUR": 1, "UAH": 1.64, "USD": 60.66, "UZS": 0.0055}
         self.job = data[0]
-        self.salary = (float(data[1]) + float(data[2])) / 2 * self.__dict_currency[data[3]]
+        self.salary = (float(data[1]) + float(data[2])) / 2 * get_rate(data[3], data[5])
         self.city = data[4]
-        self.year = int(datetime.strptime(data[5], '%Y-%m-%dT%H:%M:%S%z').strftime('%Y'))
+        self.year = parse_published_at(data[5])[2]
 
 
 class Result:
@@ -491,6 +1685,19 @@ class Result:
         Args:
             vacancies (list): список объектов Vacancy
 
+        Returns:
+            None
+        """
+        self.update(vacancies)
+        return self.finish()
+
+    def update(self, vacancies):
+        """
+        Добавляет вакансии в частичную статистику, которую затем можно объединить с другими через merge
+
+        Args:
+            vacancies (iterable): объекты VacancyForStatistics
+
         Returns:
             None
         """
@@ -502,8 +1709,37 @@ class Result:
             if self.job in vacancy.job:
                 self.job_salary_year.add_salary(vacancy.year, vacancy.salary)
                 self.job_count_year.add(vacancy.year)
+        return
+
+    def merge(self, other):
+        """
+        Добавляет частичную статистику по следующей части вакансий. Если части объединяются в порядке следования
+        в файле, результат совпадает с последовательным проходом, включая порядок ключей
+
+        Args:
+            other (Result): Частичная статистика для той же профессии
+
+        Returns:
+            None
+        """
+        self.salary_year.merge(other.salary_year)
+        self.count_year.merge(other.count_year)
+        self.job_salary_year.merge(other.job_salary_year)
+        self.job_count_year.merge(other.job_count_year)
+        self.job_salary_city.merge(other.job_salary_city)
+        self.job_count_city.merge(other.job_count_city)
+        return
+
+    def finish(self):
+        """
+        Завершает подсчет статистики после добавления всех вакансий
+
+        Returns:
+            None
+        """
         if self.job_salary_year.salary_dict == {}:
-            self.job_salary_year.salary_dict = {x: [0] for x in self.salary_year.salary_dict.keys()}
+            for x in self.salary_year.salary_dict.keys():
+                self.job_salary_year.add_salary(x, 0)
         if self.job_count_year.count_dict == {}:
             self.job_count_year.count_dict = {x: 0 for x in self.count_year.count_dict.keys()}
         self.job_count_city.get_proportion()
@@ -535,8 +1771,10 @@ class Result:
         """
         salary_list = [['Год', 'Средняя зарплата', f'Средняя зарплата - {self.job}', 'Количество вакансий',
                         f'Количество вакансий - {self.job}']]
+        average_salary = self.salary_year.get_average_salary()
+        job_average_salary = self.job_salary_year.get_average_salary()
         for year in self.salary_year.salary_dict:
-            salary_list.append([year, self.salary_year.get_average_salary()[year], self.job_salary_year.get_average_salary()[year],
+            salary_list.append([year, average_salary[year], job_average_salary[year],
                          self.count_year.count_dict[year], self.job_count_year.count_dict[year]])
         city_list = [['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']]
         city_salary = list(self.job_salary_city.top_salary(self.job_count_city.big_cities).items())
@@ -557,6 +1795,314 @@ class Result:
                self.job_count_city.top_proportion_dict
 
 
+class StatisticsSnapshot:
+    """
+    Сохраняемые рядом с файлом частичные статистики по всем его вакансиям: по годам, по городам и по годам для
+    каждого названия вакансии. Вакансии, дописанные в конец файла, добавляются без повторного чтения уже учтенных.
+    Если файл был изменен не только дописыванием в конец, статистики собираются заново по всему файлу, так как
+    вакансии могли быть удалены или добавлены в середину. Статистика для любой профессии собирается из частичных
+    статистик по названиям вакансий
+
+    Attributes:
+        salary_year (SalaryDict): зарплаты по годам
+        count_year (CountDict): число вакансий по годам
+        salary_city (SalaryDict): зарплаты по городам
+        count_city (CountDict): число вакансий по городам
+        names (dict): key - название вакансии, value - словарь, key - год, value - номер первой вакансии,
+            статистика зарплат (SalaryStat) и число вакансий
+        rows (int): Число учтенных вакансий
+        header (list): Заголовки столбцов файла
+        offset (int): Конец учтенной части файла в байтах
+        signature (str): Хеш последних байт учтенной части файла
+        high_water_mark (float): Самое позднее время публикации учтенных вакансий в секундах от начала эпохи
+    """
+    version = 3
+    signature_size = 1 << 16
+
+    def __init__(self):
+        self.salary_year = SalaryDict()
+        self.count_year = CountDict()
+        self.salary_city = SalaryDict()
+        self.count_city = CountDict()
+        self.names = {}
+        self.rows = 0
+        self.header = None
+        self.offset = 0
+        self.signature = None
+        self.high_water_mark = None
+
+    @staticmethod
+    def get_path(file_name):
+        """
+        Args:
+            file_name (str): Имя csv файла
+
+        Returns:
+            str: Имя файла с сохраненными статистиками
+        """
+        return os.path.join(file_name + '.cache', get_cache_kind('snapshot') + '.json')
+
+    @staticmethod
+    def dump_stat(stat):
+        """
+        Args:
+            stat (SalaryStat): Статистика зарплат без дисперсии
+
+        Returns:
+            list: Число зарплат, частичные суммы, минимальная и максимальная зарплата
+        """
+        return [stat.count, stat.partials, stat.min, stat.max]
+
+    @staticmethod
+    def load_stat(values):
+        """
+        Args:
+            values (list): Статистика зарплат из dump_stat
+
+        Returns:
+            SalaryStat: Статистика зарплат
+        """
+        stat = SalaryStat()
+        stat.count, stat.partials, stat.min, stat.max = values
+        return stat
+
+    def to_json(self):
+        """
+        Returns:
+            dict: Статистики в виде, который записывается в json. Словари хранятся списками пар, чтобы сохранить
+                порядок и тип ключей (годы - числа)
+        """
+        return {
+            'version': self.version, 'rows': self.rows, 'header': self.header, 'offset': self.offset,
+            'signature': self.signature, 'high_water_mark': self.high_water_mark,
+            'salary_year': [[x, self.dump_stat(y)] for x, y in self.salary_year.salary_dict.items()],
+            'count_year': list(self.count_year.count_dict.items()),
+            'salary_city': [[x, self.dump_stat(y)] for x, y in self.salary_city.salary_dict.items()],
+            'count_city': list(self.count_city.count_dict.items()),
+            'names': [[name, [[year, entry[0], self.dump_stat(entry[1]), entry[2]] for year, entry in years.items()]]
+                      for name, years in self.names.items()],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Args:
+            data (dict): Статистики из to_json
+
+        Returns:
+            StatisticsSnapshot: Статистики
+        """
+        snapshot = cls()
+        snapshot.rows, snapshot.header, snapshot.offset = data['rows'], data['header'], data['offset']
+        snapshot.signature, snapshot.high_water_mark = data['signature'], data['high_water_mark']
+        for salary_dict, items in ((snapshot.salary_year, data['salary_year']),
+                                   (snapshot.salary_city, data['salary_city'])):
+            for key, values in items:
+                salary_dict.add_stat(key, cls.load_stat(values))
+        for count_dict, items in ((snapshot.count_year, data['count_year']), (snapshot.count_city, data['count_city'])):
+            for key, count in items:
+                count_dict.add(key, count)
+        for name, years in data['names']:
+            snapshot.names[name] = {year: [first, cls.load_stat(values), count] for year, first, values, count in years}
+        return snapshot
+
+    @classmethod
+    def load(cls, file_name):
+        """
+        Args:
+            file_name (str): Имя csv файла
+
+        Returns:
+            StatisticsSnapshot: Сохраненные статистики или пустые, если их нет или файл поврежден
+        """
+        try:
+            with open(cls.get_path(file_name), encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') != cls.version:
+                return cls()
+            return cls.from_json(data)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return cls()
+
+    def save(self, file_name):
+        """
+        Сохраняет статистики в json. Ошибки записи не мешают работе программы
+
+        Args:
+            file_name (str): Имя csv файла
+        """
+        path = self.get_path(file_name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as file:
+                json.dump(self.to_json(), file, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+
+    def get_signature(self, file, offset):
+        """
+        Args:
+            file: Файл, открытый в двоичном режиме
+            offset (int): Конец учтенной части файла в байтах
+
+        Returns:
+            str: Хеш последних signature_size байт перед offset
+        """
+        start = max(0, offset - self.signature_size)
+        file.seek(start)
+        return hashlib.blake2b(file.read(offset - start)).hexdigest()
+
+    def update(self, file_name, processes=None, min_size=1 << 20):
+        """
+        Добавляет вакансии, появившиеся в файле после прошлого обновления. Если файл изменен не только
+        дописыванием в конец, статистики собираются заново: файл делится на части, которые обрабатываются
+        параллельно в processes процессах, а частичные статистики объединяются по порядку
+
+        Args:
+            file_name (str): Имя csv файла
+            processes (int): Число процессов, по умолчанию - число процессоров
+            min_size (int): Минимальный размер части файла в байтах
+
+        Returns:
+            int: Число добавленных вакансий, при сборке заново - число всех вакансий
+        """
+        header = read_header(file_name)
+        with open(file_name, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            appended = header == self.header and self.offset <= size and \
+                self.get_signature(file, self.offset) == self.signature
+            if appended:
+                rows = self.rows
+                self.ingest(get_range_rows(file_name, self.offset, size))
+            else:
+                self.__init__()
+                rows = 0
+                self.ingest_ranges(file_name, split_csv(file_name, processes or os.cpu_count(), min_size), processes)
+            self.header = header
+            self.offset = size
+            self.signature = self.get_signature(file, size)
+        return self.rows - rows
+
+    def ingest_ranges(self, file_name, ranges, processes=None):
+        """
+        Добавляет вакансии частей файла, каждая часть обрабатывается в отдельном процессе
+
+        Args:
+            file_name (str): Имя csv файла
+            ranges (list): Границы частей (начало, конец) в байтах из split_csv
+            processes (int): Число процессов, по умолчанию - число процессоров
+        """
+        args = (repeat(file_name), [x[0] for x in ranges], [x[1] for x in ranges])
+        if len(ranges) == 1:
+            partials = map(get_partial_snapshot, *args)
+        else:
+            with ProcessPoolExecutor(min(processes or os.cpu_count(), len(ranges)), initializer=set_rate_table,
+                                     initargs=(rate_table,)) as executor:
+                partials = list(executor.map(get_partial_snapshot, *args))
+        for partial in partials:
+            self.merge(partial)
+
+    def merge(self, other):
+        """
+        Добавляет частичные статистики по следующей части файла. Если части объединяются в порядке следования
+        в файле, результат совпадает с последовательным проходом, включая порядок ключей
+
+        Args:
+            other (StatisticsSnapshot): Частичные статистики
+        """
+        self.salary_year.merge(other.salary_year)
+        self.count_year.merge(other.count_year)
+        self.salary_city.merge(other.salary_city)
+        self.count_city.merge(other.count_city)
+        for name, other_years in other.names.items():
+            years = self.names.get(name)
+            if years is None:
+                years = self.names[name] = {}
+            for year, (first, stat, count) in other_years.items():
+                entry = years.get(year)
+                if entry is None:
+                    years[year] = [self.rows + first, stat, count]
+                else:
+                    entry[1].merge(stat)
+                    entry[2] += count
+        self.rows += other.rows
+        if self.high_water_mark is None or (other.high_water_mark is not None and
+                                            other.high_water_mark > self.high_water_mark):
+            self.high_water_mark = other.high_water_mark
+
+    def ingest(self, rows):
+        """
+        Добавляет вакансии в частичные статистики
+
+        Args:
+            rows (iterable): Вакансии в виде списков строк
+        """
+        for row in rows:
+            published = parse_published_at(row[-1])[0]
+            vacancy = VacancyForStatistics(row)
+            self.salary_year.add_salary(vacancy.year, vacancy.salary)
+            self.count_year.add(vacancy.year)
+            self.salary_city.add_salary(vacancy.city, vacancy.salary)
+            self.count_city.add(vacancy.city)
+            years = self.names.get(vacancy.job)
+            if years is None:
+                years = self.names[vacancy.job] = {}
+            entry = years.get(vacancy.year)
+            if entry is None:
+                entry = years[vacancy.year] = [self.rows, SalaryStat(), 0]
+            entry[1].add(vacancy.salary)
+            entry[2] += 1
+            self.rows += 1
+            if self.high_water_mark is None or published > self.high_water_mark:
+                self.high_water_mark = published
+
+    def get_result(self, job):
+        """
+        Собирает статистику для профессии. Годы добавляются в порядке первой подходящей вакансии, поэтому
+        результат совпадает с Result.get_data по всем учтенным вакансиям
+
+        Args:
+            job (str): Название профессии
+
+        Returns:
+            Result: Статистика
+        """
+        return self.get_results([job])[job]
+
+    def get_results(self, jobs):
+        """
+        Собирает статистику сразу для нескольких профессий: каждое название вакансии проверяется на все профессии
+        одним проходом SubstringMatcher
+
+        Args:
+            jobs (iterable): Названия профессий
+
+        Returns:
+            dict: key - название профессии, value - Result
+        """
+        jobs = list(dict.fromkeys(jobs))
+        matcher = SubstringMatcher(jobs)
+        entries = [[] for _ in jobs]
+        for name, years in self.names.items():
+            found = matcher.find(name)
+            for year, entry in years.items():
+                for i in found:
+                    entries[i].append((entry[0], year, entry[1], entry[2]))
+        results = {}
+        for job, job_entries in zip(jobs, entries):
+            result = results[job] = Result(job)
+            result.salary_year.merge(self.salary_year)
+            result.count_year.merge(self.count_year)
+            result.job_salary_city.merge(self.salary_city)
+            result.job_count_city.merge(self.count_city)
+            for _, year, stat, count in sorted(job_entries, key=itemgetter(0)):
+                result.job_salary_year.add_stat(year, stat)
+                result.job_count_year.add(year, count)
+            result.finish()
+        return results
+
+
 class ReportExcel:
     """
     Класс, который создает excel таблицу
@@ -597,14 +2143,17 @@ class ReportExcel:
             for i in range(len(list(ws.rows)) - 1):
                 ws.cell(row=i + 2, column=5).number_format = '0.00%'
 
-    def save_wb(self):
+    def save_wb(self, file_name='report.xlsx'):
         """
         Сохраняет таблицу
 
+        Args:
+            file_name (str): Имя файла
+
         Returns:
             None
         """
-        self.wb.save('report.xlsx')
+        self.wb.save(file_name)
 
 
 class ReportPng:
@@ -697,83 +2246,177 @@ class ReportPng:
         ax.pie(city_count.values(), labels=city_count.keys(), textprops={'fontsize': 6})
 
     @staticmethod
-    def print_graph():
+    def print_graph(file_name='graph.png'):
         """
         Сохраняет графики
 
+        Args:
+            file_name (str): Имя файла
+
         Returns:
             None
         """
         plt.tight_layout()
-        plt.savefig("graph.png")
+        plt.savefig(file_name)
         plt.show()
 
 
 def csv_reader(file_name):
     """
-    Читает файл, получает заголовки столбцов и вакансии, содуржащие полную информацию
+    Читает файл, получает вакансии, содуржащие полную информацию. Файл читается построчно,
+    вакансии не загружаются в память целиком
 
     Args:
         file_name (str) : Имя файла, введного пользователем
 
     Returns:
-        list: список вакансий
+        iterator: итератор по вакансиям
     """
-    file_csv = open(file_name, encoding='utf_8_sig')
-    reader_csv = csv.reader(file_csv)
-    list_data = list(filter(lambda x: '' not in x, reader_csv))
-    if len(list_data) == 0:
+    rows = get_rows(file_name)
+    if next(rows, None) is None:
         return print('Пустой файл')
-    if len(list_data[1:]) == 0:
+    first_row = next(rows, None)
+    if first_row is None:
         return print('Нет данных')
-    return list_data[1:]
+    return chain([first_row], rows)
+
+
+def get_partial_snapshot(file_name, start, end):
+    """
+    Считает частичные статистики по части файла. Выполняется в отдельном процессе
+
+    Args:
+        file_name (str): Имя файла
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+
+    Returns:
+        StatisticsSnapshot: Частичные статистики части
+    """
+    snapshot = StatisticsSnapshot()
+    snapshot.ingest(get_range_rows(file_name, start, end))
+    return snapshot
+
+
+def get_snapshot(file_name):
+    """
+    Загружает сохраненные частичные статистики файла, добавляет в них новые вакансии и сохраняет
+
+    Args:
+        file_name (str): Имя файла, введного пользователем
+
+    Returns:
+        StatisticsSnapshot: Частичные статистики, None если файл пустой или без данных
+    """
+    snapshot = StatisticsSnapshot.load(file_name)
+    snapshot.update(file_name)
+    if snapshot.rows == 0:
+        csv_reader(file_name)
+        return None
+    snapshot.save(file_name)
+    return snapshot
+
+
+def get_snapshot_result(file_name, job):
+    """
+    Считает статистику по сохраненным частичным статистикам файла, предварительно добавив в них новые вакансии
+
+    Args:
+        file_name (str): Имя файла, введного пользователем
+        job (str): Название профессии
 
+    Returns:
+        Result: Статистика, None если файл пустой или без данных
+    """
+    snapshot = get_snapshot(file_name)
+    return None if snapshot is None else snapshot.get_result(job)
+
+
+def create_reports(result, suffix=''):
+    """
+    Создает excel таблицу, графики и pdf отчет по статистике
+
+    Args:
+        result (Result): Статистика
+        suffix (str): Добавляется к именам файлов отчетов
+
+    Returns:
+        None
+    """
+    wb = ReportExcel()
+    salary_list, city_list = result.get_excel_data()
+    wb.create_sheet('Статистика по годам', salary_list)
+    wb.create_sheet('Статистика по городам', city_list, True)
+    wb.save_wb(f'report{suffix}.xlsx')
+
+    fig = ReportPng()
+    salary_year, salary_count, city_salary, city_count = result.get_png_data()
+    fig.add_graph("Уровень зарплат по годам", ['средняя з/п', f'з/п {result.job}'], salary_year)
+    fig.add_graph("Количество вакансий по годам", ['Количество вакансий', f'Количество вакансий {result.job}'],
+                  salary_count)
+    fig.add_turned_graph("Уровень зарплат по городам", city_salary)
+    fig.add_round_graph("Доля вакансий по городам", city_count)
+    fig.print_graph(f'graph{suffix}.png')
+
+    table1 = [x[:2] for x in city_list]
+    table2 = [x[3:] for x in city_list]
+    for row in table2[1:]:
+        row[1] = ("{:.2%}".format(row[1]).replace('.', ','))
+
+    env = Environment(loader=FileSystemLoader('.'))
+    template = env.get_template("pdf_template.html")
+    pdf_template = template.render({'job': result.job, 'table_big': salary_list, 'table1': table1, 'table2': table2})
+    config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
+    pdfkit.from_string(pdf_template, f'report{suffix}.pdf', configuration=config, options={"enable-local-file-access": None})
+
+
+def get_results(file_name, jobs):
+    """
+    Считает статистику для нескольких профессий по сохраненным частичным статистикам файла
+
+    Args:
+        file_name (str): Имя файла, введного пользователем
+        jobs (list): Названия профессий
 
-choose = input('Выберите формат выходных данных ')
-if choose == 'Вакансии':
-    file_name = input('Введите название файла: ')
-    input_data = InputConnect()
-    if input_data.error_message != '':
-        print(input_data.error_message)
+    Returns:
+        dict: key - название профессии, value - Result, None если файл пустой или без данных
+    """
+    snapshot = get_snapshot(file_name)
+    return None if snapshot is None else snapshot.get_results(jobs)
+
+
+if __name__ == '__main__':
+    rate_source = 'постоянные'
+    if len(sys.argv) > 1:
+        try:
+            load_rate_table(sys.argv[1])
+            rate_source = sys.argv[1]
+        except (OSError, ValueError):
+            print(f'Не удалось прочитать файл курсов {sys.argv[1]}')
+    print(f'Курсы валют: {rate_source}')
+    choose = input('Выберите формат выходных данных ')
+    if choose == 'Вакансии':
+        file_name = input('Введите название файла: ')
+        input_data = InputConnect()
+        if input_data.error_message != '':
+            print(input_data.error_message)
+        else:
+            data = DataSet(file_name)
+            if not data.error:
+                input_data.print_table(data.vacancies)
+    elif choose == 'Статистика':
+        file_name = input('Введите название файла: ')
+        job = input('Введите название профессии: ')
+        jobs = re.split(r'\s*;\s*', job)
+        snapshot = get_snapshot(file_name)
+        if snapshot is not None and len(jobs) == 1:
+            result = snapshot.get_result(job)
+            result.print_result()
+            create_reports(result)
+        elif snapshot is not None:
+            for number, result in enumerate(snapshot.get_results(jobs).values(), 1):
+                print(f'Профессия: {result.job}')
+                result.print_result()
+                create_reports(result, f'_{number}')
     else:
-        data = DataSet(file_name)
-        if not data.error:
-            input_data.print_table(data.vacancies)
-elif choose == 'Статистика':
-    file_name = input('Введите название файла: ')
-    job = input('Введите название профессии: ')
-    file = open(file_name, encoding='utf_8_sig')
-    data = csv_reader(file_name)
-    if data is not None:
-        vacancies = [VacancyForStatistics(x) for x in data]
-        result = Result(job)
-        result.get_data(vacancies)
-        result.print_result()
-
-        wb = ReportExcel()
-        salary_list, city_list = result.get_excel_data()
-        wb.create_sheet('Статистика по годам', salary_list)
-        wb.create_sheet('Статистика по городам', city_list, True)
-        wb.save_wb()
-
-        fig = ReportPng()
-        salary_year, salary_count, city_salary, city_count = result.get_png_data()
-        fig.add_graph("Уровень зарплат по годам", ['средняя з/п', f'з/п {job}'], salary_year)
-        fig.add_graph("Количество вакансий по годам", ['Количество вакансий', f'Количество вакансий {job}'],
-                      salary_count)
-        fig.add_turned_graph("Уровень зарплат по городам", city_salary)
-        fig.add_round_graph("Доля вакансий по городам", city_count)
-        fig.print_graph()
-
-        table1 = [x[:2] for x in city_list]
-        table2 = [x[3:] for x in city_list]
-        for row in table2[1:]:
-            row[1] = ("{:.2%}".format(row[1]).replace('.', ','))
-
-        env = Environment(loader=FileSystemLoader('.'))
-        template = env.get_template("pdf_template.html")
-        pdf_template = template.render({'job': job, 'table_big': salary_list, 'table1': table1, 'table2': table2})
-        config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": None})
-else:
-    print('Некорректный формат выходных данных')
\ No newline at end of file
+        print('Некорректный формат выходных данных')
\ No newline at end of file
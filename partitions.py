@@ -0,0 +1,257 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from multiprocessing.shared_memory import SharedMemory
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+extensions = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+
+
+def partition(df, column, columns=None):
+    """
+    Делит DataFrame на части по значениям столбца. Номера строк частей берутся из groupby().indices,
+    строки один раз переставляются так, чтобы каждая часть шла подряд, и части становятся срезами
+    без копирования данных. Части идут в порядке первого появления значения, строки внутри части -
+    в исходном порядке
+
+    Args:
+        df (DataFrame): Таблица
+        column (str): Столбец, по которому делится таблица
+        columns (list): Столбцы частей, None - все столбцы
+
+    Returns:
+        dict: key - значение столбца, value - DataFrame
+    """
+    indices = df.groupby(column, sort=False, observed=True).indices
+    if not indices:
+        return {}
+    ordered = (df if columns is None else df[columns]).take(np.concatenate(list(indices.values())))
+    partitions = {}
+    start = 0
+    for key, rows in indices.items():
+        partitions[key] = ordered.iloc[start:start + len(rows)]
+        start += len(rows)
+    return partitions
+
+
+def check_format(file_format):
+    """
+    Проверяет, что формат известен и для него установлен pyarrow
+
+    Args:
+        file_format (str): 'csv', 'parquet' или 'feather'
+    """
+    if file_format not in extensions:
+        raise ValueError(f'Неизвестный формат: {file_format}')
+    if file_format != 'csv' and pyarrow is None:
+        raise ImportError(f'Для формата {file_format} нужен pyarrow')
+
+
+def get_format(args):
+    """
+    Формат частей из аргументов командной строки. По умолчанию 'csv', 'parquet' и 'feather'
+    включаются только явно, даже если pyarrow установлен
+
+    Args:
+        args (list): Аргументы командной строки без имени скрипта
+
+    Returns:
+        str: 'csv', 'parquet' или 'feather'
+    """
+    file_format = args[0] if args else 'csv'
+    check_format(file_format)
+    return file_format
+
+
+def write_frame(df, file_name, file_format='csv'):
+    """
+    Args:
+        df (DataFrame): Таблица
+        file_name (str): Имя файла
+        file_format (str): 'csv', 'parquet' или 'feather'
+    """
+    if file_format == 'csv':
+        df.to_csv(file_name, index=False)
+    elif file_format == 'parquet':
+        df.to_parquet(file_name, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(file_name)
+
+
+def get_partition_path(path, column, key):
+    """
+    Args:
+        path (str): Папка набора данных
+        column (str): Столбец, по которому разбит набор
+        key: Значение столбца
+
+    Returns:
+        str: Папка части '<path>/<column>=<key>'
+    """
+    return os.path.join(path, f'{column}={key}')
+
+
+def clear_partitions(path, column):
+    """
+    Создает папку набора данных и удаляет из нее файлы и папки частей прошлой записи
+
+    Args:
+        path (str): Папка набора данных
+        column (str): Столбец, по которому разбит набор
+    """
+    os.makedirs(path, exist_ok=True)
+    for file_name in os.listdir(path):
+        if file_name.startswith(f'{column}='):
+            shutil.rmtree(os.path.join(path, file_name))
+        elif file_name.endswith(('.csv', '.part')):
+            os.remove(os.path.join(path, file_name))
+
+
+def write_partitions(partitions, path, executor, file_format='csv', column='year'):
+    """
+    Записывает части в фоновом потоке, предварительно удаляя файлы прошлой записи. В формате csv каждая
+    часть записывается в файл '<path>/<значение>.csv', в форматах parquet и feather - в папку
+    '<path>/<column>=<значение>', чтобы части можно было прочитать функцией read_partition только
+    с нужными столбцами
+
+    Args:
+        partitions (dict): key - значение столбца, value - DataFrame
+        path (str): Папка для файлов
+        executor (Executor): Пул, в котором записываются файлы
+        file_format (str): 'csv', 'parquet' или 'feather'
+        column (str): Столбец, по которому разбит набор
+
+    Returns:
+        list: Future для каждого файла
+    """
+    check_format(file_format)
+    clear_partitions(path, column)
+    if file_format == 'csv':
+        return [executor.submit(df.to_csv, os.path.join(path, f'{key}.csv'), index=False)
+                for key, df in partitions.items()]
+    futures = []
+    for key, df in partitions.items():
+        partition_path = get_partition_path(path, column, key)
+        os.makedirs(partition_path)
+        futures.append(executor.submit(write_frame, df, os.path.join(partition_path, f'part-0000.{file_format}'),
+                                       file_format))
+    return futures
+
+
+def find_partitions(path, column='year'):
+    """
+    Args:
+        path (str): Папка набора данных
+        column (str): Столбец, по которому разбит набор
+
+    Returns:
+        dict: key - значение столбца (int, если оно целое), value - папка части, по возрастанию значений
+    """
+    partitions = {}
+    for file_name in os.listdir(path):
+        if file_name.startswith(f'{column}='):
+            key = file_name[len(column) + 1:]
+            partitions[int(key) if key.lstrip('-').isdigit() else key] = os.path.join(path, file_name)
+    return dict(sorted(partitions.items()))
+
+
+def read_frame(file_name, columns=None, dtype=None):
+    """
+    Args:
+        file_name (str): Имя csv, parquet или feather файла
+        columns (list): Читаемые столбцы, None - все столбцы
+        dtype (dict): Типы столбцов
+
+    Returns:
+        DataFrame: Таблица
+    """
+    if file_name.endswith('.csv'):
+        return pd.read_csv(file_name, usecols=columns, dtype=dtype)
+    if file_name.endswith('.parquet'):
+        df = pd.read_parquet(file_name, columns=columns)
+    else:
+        df = pd.read_feather(file_name, columns=columns)
+    if dtype:
+        df = df.astype({x: y for x, y in dtype.items() if x in df.columns})
+    return df
+
+
+def read_partition(path, columns=None, dtype=None):
+    """
+    Читает часть набора данных. Столбцы parquet и feather файлов хранятся отдельно, поэтому ненужные
+    столбцы не читаются и текст не разбирается заново
+
+    Args:
+        path (str): Файл части или папка части из find_partitions
+        columns (list): Читаемые столбцы, None - все столбцы
+        dtype (dict): Типы столбцов
+
+    Returns:
+        DataFrame: Таблица
+    """
+    if not os.path.isdir(path):
+        return read_frame(path, columns, dtype)
+    frames = [read_frame(os.path.join(path, x), columns, dtype) for x in sorted(os.listdir(path))
+              if x.endswith(tuple(extensions.values()))]
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    if dtype:
+        df = df.astype({x: y for x, y in dtype.items() if x in df.columns})
+    return df
+
+
+def share_arrays(arrays):
+    """
+    Копирует одномерные массивы частей в один блок общей памяти (float64, строка на каждый массив), чтобы
+    процессы пула читали их по имени блока, а не получали через pickle. Блок нужно закрыть и удалить
+    методами close() и unlink()
+
+    Args:
+        arrays (dict): key - значение столбца, value - массивы части одинаковой длины
+
+    Returns:
+        tuple: SharedMemory, число массивов, общая длина и dict: key - (начало, конец) части в блоке
+    """
+    count = len(next(iter(arrays.values()), ()))
+    size = sum(len(x[0]) for x in arrays.values())
+    shared = SharedMemory(create=True, size=max(1, count * size * 8))
+    data = np.ndarray((count, size), np.float64, shared.buf)
+    bounds = {}
+    start = 0
+    for key, values in arrays.items():
+        end = start + len(values[0])
+        for i, array in enumerate(values):
+            data[i, start:end] = array
+        bounds[key] = (start, end)
+        start = end
+    del data
+    return shared, count, size, bounds
+
+
+def read_shared(function, name, count, size, start, end):
+    """
+    Подключается к блоку из share_arrays и вызывает function с массивами части. Массивы - представления
+    блока без копирования, поэтому function не должна их сохранять
+
+    Args:
+        function (callable): Функция от массивов части
+        name (str): Имя блока общей памяти
+        count (int): Число массивов
+        size (int): Общая длина
+        start (int): Начало части
+        end (int): Конец части
+
+    Returns:
+        Результат function
+    """
+    shared = SharedMemory(name)
+    try:
+        return function(*np.ndarray((count, size), np.float64, shared.buf)[:, start:end])
+    finally:
+        shared.close()
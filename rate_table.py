@@ -0,0 +1,163 @@
+import csv
+import hashlib
+import numpy as np
+
+
+def get_month(value):
+    """
+    Args:
+        value (str): Дата, которая начинается с 'гггг-мм'
+
+    Returns:
+        int: Номер месяца от начала эры, год * 12 + месяц - 1
+    """
+    return int(value[:4]) * 12 + int(value[5:7]) - 1
+
+
+def get_months(values):
+    """
+    Векторный вариант get_month: цифры года и месяца берутся из кодов символов без разбора каждой строки
+
+    Args:
+        values (iterable): Даты, которые начинаются с 'гггг-мм'
+
+    Returns:
+        ndarray: Номера месяцев (int64), -1 для значений, которые не являются датой
+    """
+    digits = np.asarray(values).astype('U7').view(np.uint32).reshape(-1, 7).astype(np.int64) - ord('0')
+    months = (digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]) * 12 \
+        + digits[:, 5] * 10 + digits[:, 6] - 1
+    valid = ((digits[:, [0, 1, 2, 3, 5, 6]] >= 0) & (digits[:, [0, 1, 2, 3, 5, 6]] <= 9)).all(axis=1)
+    return np.where(valid, months, -1)
+
+
+class RateTable:
+    """
+    Курсы валют к рублю по месяцам в виде плотной матрицы NumPy: строка - месяц от первого месяца таблицы,
+    столбец - валюта, поэтому курс находится за O(1) без поиска по датам. Рубль всегда имеет курс 1
+
+    Attributes:
+        first_month (int): Номер первого месяца таблицы, см. get_month
+        currencies (list): Коды валют по столбцам
+        columns (dict): key - код валюты, value - номер столбца
+        rates (ndarray): Курсы (float64), NaN если курса нет
+        key (str): Хеш курсов, по которому различаются кеши, посчитанные с разными таблицами
+    """
+    def __init__(self, first_month, currencies, rates):
+        """
+        Args:
+            first_month (int): Номер первого месяца таблицы
+            currencies (list): Коды валют
+            rates (array_like): Курсы, строка на месяц и столбец на валюту
+        """
+        self.first_month = first_month
+        self.currencies = list(currencies)
+        self.columns = {x: i for i, x in enumerate(self.currencies)}
+        self.rates = np.asarray(rates, dtype=np.float64).reshape(-1, len(self.currencies))
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(repr((first_month, self.currencies)).encode())
+        digest.update(self.rates.tobytes())
+        self.key = digest.hexdigest()
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        """
+        Args:
+            header (list): Заголовки: 'date' и коды валют
+            rows (iterable): Строки курсов, дата в формате 'гггг-мм', пустое значение или None - нет курса
+
+        Returns:
+            RateTable: Таблица курсов, пропущенные месяцы заполняются NaN
+        """
+        rows = {get_month(row[0]): [np.nan if x in ('', None) or x != x else float(x) for x in row[1:]]
+                for row in rows}
+        currencies = header[1:]
+        if not rows:
+            return cls(0, currencies, np.empty((0, len(currencies))))
+        first_month = min(rows)
+        rates = np.full((max(rows) - first_month + 1, len(currencies)), np.nan)
+        for month, values in rows.items():
+            rates[month - first_month] = values
+        return cls(first_month, currencies, rates)
+
+    @classmethod
+    def from_csv(cls, file_name):
+        """
+        Args:
+            file_name (str): Файл курсов, например currency.csv
+
+        Returns:
+            RateTable: Таблица курсов
+        """
+        with open(file_name, encoding='utf_8_sig', newline='') as file:
+            reader = csv.reader(file)
+            return cls.from_rows(next(reader), reader)
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Args:
+            df (DataFrame): Курсы, столбец date и столбец на каждую валюту
+
+        Returns:
+            RateTable: Таблица курсов
+        """
+        return cls.from_rows(list(df.columns), df.itertuples(index=False, name=None))
+
+    def get_rate(self, currency, date, missing=np.nan):
+        """
+        Args:
+            currency (str): Код валюты
+            date (str): Дата, которая начинается с 'гггг-мм'
+            missing (float): Курс валюты, которой нет в таблице
+
+        Returns:
+            float: Курс к рублю, NaN если месяц вне таблицы или курса за месяц нет
+        """
+        if currency == 'RUR':
+            return 1.0
+        column = self.columns.get(currency)
+        if column is None:
+            return missing
+        row = get_month(date) - self.first_month
+        if 0 <= row < len(self.rates):
+            return float(self.rates[row, column])
+        return np.nan
+
+    def get_rates(self, currencies, dates, missing=np.nan):
+        """
+        Векторный вариант get_rate
+
+        Args:
+            currencies (array_like): Коды валют
+            dates (array_like): Даты, которые начинаются с 'гггг-мм'
+            missing (float): Курс валюты, которой нет в таблице
+
+        Returns:
+            ndarray: Курсы к рублю
+        """
+        codes, inverse = np.unique(np.asarray(currencies, dtype=object).astype(str), return_inverse=True)
+        columns = np.array([self.columns.get(x, -1) for x in codes], dtype=np.int64)[inverse.reshape(-1)]
+        months = get_months(dates)
+        rows = months - self.first_month
+        found = (columns >= 0) & (months >= 0) & (rows >= 0) & (rows < len(self.rates))
+        result = np.full(len(columns), np.nan)
+        result[found] = self.rates[rows[found], columns[found]]
+        result[columns < 0] = missing
+        result[np.array([x == 'RUR' for x in codes], dtype=bool)[inverse.reshape(-1)]] = 1.0
+        return result
+
+    def convert(self, salaries, currencies, dates, missing=np.nan):
+        """
+        Переводит зарплаты в рубли по курсам месяцев публикации
+
+        Args:
+            salaries (array_like): Зарплаты в валюте
+            currencies (array_like): Коды валют
+            dates (array_like): Даты публикации, которые начинаются с 'гггг-мм'
+            missing (float): Курс валюты, которой нет в таблице
+
+        Returns:
+            ndarray: Зарплаты в рублях, NaN если курса нет
+        """
+        return np.asarray(salaries, dtype=np.float64) * self.get_rates(currencies, dates, missing)
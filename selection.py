@@ -0,0 +1,36 @@
+import heapq
+from operator import itemgetter
+
+
+def top_n(items, n=10, allowed=None):
+    """
+    Выбирает до n пар с наибольшими значениями через heapq, не сортируя все пары. При равных значениях
+    порядок такой же, как у sorted(items, key=..., reverse=True)[:n]
+
+    Args:
+        items (iterable): Пары (ключ, значение)
+        n (int): Сколько пар выбрать
+        allowed (set): Ключи, среди которых выбирать, None - среди всех
+
+    Returns:
+        dict: До n пар в порядке убывания значений
+    """
+    if allowed is not None:
+        items = ((key, value) for key, value in items if key in allowed)
+    return dict(heapq.nlargest(n, items, key=itemgetter(1)))
+
+
+def top_n_frame(df, column, n=10):
+    """
+    Выбирает до n строк DataFrame с наибольшими значениями столбца без полной сортировки. При равных значениях
+    порядок такой же, как у устойчивой сортировки по убыванию
+
+    Args:
+        df (DataFrame): Таблица
+        column (str): Столбец, по которому выбираются строки
+        n (int): Сколько строк выбрать
+
+    Returns:
+        DataFrame: До n строк в порядке убывания значений столбца
+    """
+    return df.nlargest(n, column, keep='first')
@@ -0,0 +1,68 @@
+from collections import deque
+
+
+class SubstringMatcher:
+    """
+    Поиск всех подстрок из списка за один проход по строке (алгоритм Ахо-Корасик). Результаты поиска
+    запоминаются по строкам, так как названия вакансий многократно повторяются
+
+    Attributes:
+        patterns (list): Искомые подстроки
+        goto (list): Переходы бора, для каждой вершины словарь, key - символ, value - номер вершины
+        fail (list): Суффиксные ссылки вершин
+        output (list): Номера подстрок, которые заканчиваются в вершине
+        found (dict): key - строка, value - номера найденных в ней подстрок
+    """
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns (iterable): Искомые подстроки
+        """
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        self.found = {}
+        for i, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = self.goto[node][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                node = next_node
+            self.output[node].add(i)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.goto[node].items():
+                queue.append(next_node)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_node] = self.goto[fail].get(char, 0)
+                self.output[next_node] |= self.output[self.fail[next_node]]
+
+    def find(self, text):
+        """
+        Args:
+            text (str): Строка
+
+        Returns:
+            tuple: Номера подстрок, которые есть в строке, по возрастанию
+        """
+        result = self.found.get(text)
+        if result is None:
+            goto, fail, output = self.goto, self.fail, self.output
+            found = set(output[0])
+            node = 0
+            for char in text:
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                if output[node]:
+                    found |= output[node]
+            result = self.found[text] = tuple(sorted(found))
+        return result
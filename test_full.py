@@ -1,5 +1,39 @@
-from unittest import TestCase
-from full import Salary, Vacancy, VacancyForStatistics
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import threading
+import importlib.util
+import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from statistics import mean, pvariance
+from datetime import datetime
+from unittest import TestCase, skipIf
+from full import Salary, Vacancy, VacancyForStatistics, VacancyTable, DataSet, csv_reader, \
+    parse_published_at, dict_parameter, dict_sort, Query, InputConnect, DatasetCache, SalaryDict, CountDict, \
+    Result, get_range_rows, StatisticsSnapshot, get_snapshot_result, get_results, set_rate_table, get_cache_kind, \
+    load_rate_table, get_rows
+from substrings import SubstringMatcher
+from selection import top_n
+from csv_chunks import split_csv, find_record_borders, read_range, read_header
+from partitions import partition, write_partitions, find_partitions, read_partition, share_arrays, \
+    read_shared, get_format, pyarrow
+from currency_rates import RateFetcher, parse_rates, convert_salaries
+from rate_table import RateTable
+from create_big_csv import NewCsv
+from dataset_profile import load_profile, get_profile_path, get_moments, create_profile
+
+
+def create_csv(text):
+    file = tempfile.NamedTemporaryFile('w', encoding='utf_8_sig', suffix='.csv', delete=False)
+    file.write(text)
+    file.close()
+    return file.name
 
 
 class SalaryTests(TestCase):
@@ -69,3 +103,695 @@ class VacancyForStatisticsTests(TestCase):
     def test_salary_with_currency(self):
         self.assertEqual(VacancyForStatistics(['Аналитик', '10.5', '21.5', 'USD', 'Москва', '2022-06-14T11:44:58+0300']).salary, 970.56)
 
+
+class CsvReaderTests(TestCase):
+    def setUp(self):
+        self.files = []
+
+    def tearDown(self):
+        for file_name in self.files:
+            os.remove(file_name)
+            shutil.rmtree(file_name + '.cache', ignore_errors=True)
+
+    def create_csv(self, text):
+        file_name = create_csv(text)
+        self.files.append(file_name)
+        return file_name
+
+    def test_empty_file(self):
+        self.assertIsNone(csv_reader(self.create_csv('')))
+
+    def test_no_data(self):
+        self.assertIsNone(csv_reader(self.create_csv('name,salary_from,salary_to,salary_currency,area_name,published_at\n')))
+
+    def test_rows_without_empty_values(self):
+        file_name = self.create_csv('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                                    'Аналитик,10,20,RUR,Москва,2022-06-14T11:44:58+0300\n'
+                                    'Аналитик,,20,RUR,Москва,2022-06-14T11:44:58+0300\n'
+                                    'Программист,30,40,RUR,Казань,2022-06-14T11:44:58+0300\n')
+        self.assertEqual([x[0] for x in csv_reader(file_name)], ['Аналитик', 'Программист'])
+
+    def test_data_set_table(self):
+        file_name = self.create_csv('name,description,key_skills,experience_id,premium,employer_name,salary_from,'
+                                    'salary_to,salary_gross,salary_currency,area_name,published_at\n'
+                                    'Аналитик,<p>Описание   вакансии</p>,SQL,noExperience,False,Компания,'
+                                    '10,20,True,RUR,Москва,2022-06-14T11:44:58+0300\n')
+        data = DataSet(file_name)
+        self.assertEqual(type(data.vacancies).__name__, 'VacancyTable')
+        self.assertEqual([x.descr for x in data.vacancies], ['Описание вакансии'])
+
+
+class CleanRowsTests(TestCase):
+    def test_clean_rows(self):
+        rows = [['<b>Аналитик</b>', '<p>Описание\n  <i>вакансии</i></p>', 'SQL\nPython  Git', 'noExperience']]
+        self.assertEqual(list(DataSet.clean_rows(rows)), [('Аналитик', 'Описание вакансии', 'SQL\nPython  Git',
+                                                          'noExperience')])
+
+    def test_clean_rows_batches(self):
+        rows = [[f'<b>{i}</b>', ' a  b '] for i in range(25)]
+        self.assertEqual(list(DataSet.clean_rows(rows, batch_size=10)), [(str(i), 'a b') for i in range(25)])
+
+
+class VacancyTableTests(TestCase):
+    def setUp(self):
+        self.rows = [['Аналитик', 'Описание', 'SQL', 'noExperience', 'False', 'Компания', '10', '20', 'True', 'USD',
+                      'Москва', '2022-06-14T11:44:58+0300'],
+                     ['Программист', 'Описание', 'Python', 'moreThan6', 'True', 'Компания', '30.5', '40', 'False',
+                      'RUR', 'Москва', '2021-01-02T10:00:00+0300']]
+        self.table = VacancyTable(self.rows)
+
+    def test_length(self):
+        self.assertEqual(len(self.table), 2)
+
+    def test_categories(self):
+        self.assertEqual(list(self.table.area), [0, 0])
+        self.assertEqual(self.table.categories['area'].values, ['Москва'])
+
+    def test_translate_vacancy(self):
+        for row, view in zip(self.rows, self.table):
+            self.assertEqual(view.translate_vacancy(), Vacancy(row).translate_vacancy())
+
+    def test_salary(self):
+        self.assertEqual(self.table[0].salary.average_salary, 909.9)
+        self.assertEqual(self.table[1].salary.salary_from, 30)
+
+
+class ParsePublishedAtTests(TestCase):
+    def test_same_as_strptime(self):
+        for value in ['2022-06-14T11:44:58+0300', '2022-06-14T23:59:01+0300', '2007-12-03T00:00:00-0500']:
+            date = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+            self.assertEqual(parse_published_at(value), (date.timestamp(), date.strftime('%d.%m.%Y'), date.year))
+
+
+class TableTestCase(TestCase):
+    def setUp(self):
+        self.rows = [[f'Вакансия {i % 3}', 'Описание', ['SQL', 'SQL\nGit', 'Git\nPython'][i % 3],
+                      ['noExperience', 'moreThan6'][i % 2], ['False', 'True'][i % 5 == 0],
+                      f'Компания {i % 4}', str(i * 1000), str(i * 1000 + 5000), 'True',
+                      ['RUR', 'USD'][i % 2], ['Москва', 'Казань'][i % 7 == 0],
+                      f'2022-06-{i % 3 + 10}T11:44:58+0300'] for i in range(30)]
+        self.table = VacancyTable(self.rows)
+
+
+class VacancyIndexTests(TableTestCase):
+    def assert_same_as_scan(self, column, parameter):
+        expected = [x.index for x in self.table if dict_parameter[column](x, parameter)]
+        self.assertEqual([x.index for x in self.table.filter(column, parameter)], expected)
+
+    def test_hash_indexes(self):
+        for column, parameter in [('Название', 'Вакансия 1'), ('Компания', 'Компания 3'), ('Опыт работы', 'Нет опыта'),
+                                  ('Премиум-вакансия', 'Да'), ('Идентификатор валюты оклада', 'Доллары'),
+                                  ('Название региона', 'Казань'), ('Дата публикации вакансии', '11.06.2022'),
+                                  ('Название региона', 'Пермь')]:
+            self.assert_same_as_scan(column, parameter)
+
+    def test_skills_index(self):
+        for parameter in ['SQL', 'Git', 'SQL, Git', 'Python, Git', 'Java']:
+            self.assert_same_as_scan('Навыки', parameter)
+
+    def test_salary_index(self):
+        for parameter in ['0', '4000', '5000', '15500', '29000', '40000', '-1']:
+            self.assert_same_as_scan('Оклад', parameter)
+
+    def test_not_indexed_column(self):
+        self.assert_same_as_scan('Описание', 'Описание')
+
+
+class QueryTests(TableTestCase):
+    def assert_same_as_match(self, groups):
+        query = Query(groups)
+        expected = [x.index for x in self.table if query.match(x)]
+        self.assertEqual([x.index for x in query.select(self.table)], expected)
+        return expected
+
+    def test_and(self):
+        rows = self.assert_same_as_match([[['Название', 'Вакансия 1'], ['Навыки', 'SQL'], ['Оклад', '10000']]])
+        self.assertEqual(rows, [7, 10])
+
+    def test_or(self):
+        rows = self.assert_same_as_match([[['Название региона', 'Казань']], [['Премиум-вакансия', 'Да']]])
+        self.assertEqual(rows, [0, 5, 7, 10, 14, 15, 20, 21, 25, 28])
+
+    def test_salary_range(self):
+        rows = self.assert_same_as_match([[['Оклад', '20000 - 22000'], ['Опыт работы', 'Нет опыта']]])
+        self.assertEqual(rows, [16, 18, 20, 22])
+
+    def test_date_range(self):
+        rows = self.assert_same_as_match([[['Дата публикации вакансии', '11.06.2022 - 12.06.2022'],
+                                           ['Описание', 'Описание']]])
+        self.assertEqual(len(rows), 20)
+
+
+class SelectRowsTests(TableTestCase):
+    def select_rows(self, vacancies, sort_param, is_reverse, borders):
+        input_connect = InputConnect.__new__(InputConnect)
+        input_connect.sort_param = sort_param
+        input_connect.is_reverse = is_reverse
+        input_connect.borders = borders
+        return [(number, x.translate_vacancy()) for number, x in input_connect.select_rows(vacancies)]
+
+    def test_same_as_sorted(self):
+        subset = [x for x in self.table if x.index % 4 != 1]
+        for sort_param in dict_sort:
+            for is_reverse in [False, True]:
+                for vacancies in [self.table, subset, [Vacancy(x) for x in self.rows]]:
+                    expected = sorted(vacancies, key=dict_sort[sort_param], reverse=is_reverse)
+                    expected = [(i + 1, expected[i].translate_vacancy()) for i in range(3, 9)]
+                    self.assertEqual(self.select_rows(vacancies, sort_param, is_reverse, [3, 9]), expected)
+
+    def test_without_sort(self):
+        self.assertEqual(self.select_rows(self.table, '', False, [28]),
+                         [(29, self.table[28].translate_vacancy()), (30, self.table[29].translate_vacancy())])
+
+
+class CsvFileTestCase(TableTestCase):
+    header = 'name,description,key_skills,experience_id,premium,employer_name,salary_from,salary_to,salary_gross,' \
+             'salary_currency,area_name,published_at\n'
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'vacancies.csv')
+        self.write_csv(self.rows)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_csv(self, rows):
+        with open(self.file_name, 'w', encoding='utf_8_sig') as file:
+            file.write(self.header)
+            for row in rows:
+                file.write(','.join(f'"{x}"' for x in row) + '\n')
+
+
+class DatasetCacheTests(CsvFileTestCase):
+    def test_vacancies_from_cache(self):
+        expected = [x.translate_vacancy() for x in DataSet(self.file_name).vacancies]
+        data = DataSet(self.file_name)
+        self.assertEqual(type(data.vacancies.descr).__name__, 'StringColumn')
+        self.assertEqual(data.file_name, self.header.strip().split(','))
+        self.assertEqual([x.translate_vacancy() for x in data.vacancies], expected)
+        self.assertEqual([x.index for x in data.vacancies.filter('Навыки', 'Git')],
+                         [x.index for x in self.table.filter('Навыки', 'Git')])
+
+    def test_changed_file(self):
+        DataSet(self.file_name)
+        self.write_csv(self.rows[:10])
+        self.assertEqual(len(DataSet(self.file_name).vacancies), 10)
+
+    def test_touched_file(self):
+        DataSet(self.file_name)
+        os.utime(self.file_name, ns=(0, 0))
+        cache = DatasetCache(self.file_name, 'vacancies', VacancyTable)
+        self.assertTrue(cache.is_valid())
+        self.assertEqual(cache.meta['mtime'], 0)
+
+    def test_touched_read_only_cache(self):
+        DataSet(self.file_name)
+        os.utime(self.file_name, ns=(0, 0))
+        cache = DatasetCache(self.file_name, 'vacancies', VacancyTable)
+
+        def write_meta(meta):
+            raise PermissionError
+
+        cache.write_meta = write_meta
+        self.assertTrue(cache.is_valid())
+        self.assertEqual(len(cache.load()[0]), 30)
+
+    def test_stale_parts(self):
+        cache = DatasetCache(self.file_name, 'vacancies', VacancyTable)
+        cache.save([self.table] * 3)
+        cache.save([self.table])
+        self.assertEqual(sorted(x for x in os.listdir(cache.path) if x.startswith('part-')), ['part-00000'])
+        self.assertTrue(cache.is_valid())
+        self.assertEqual(len(cache.load()), 1)
+
+
+class SalaryDictTests(TestCase):
+    def test_same_as_mean(self):
+        random.seed(1)
+        salaries = {key: [random.uniform(1, 10 ** 6) * random.choice([1, 0.1, 60.66]) for _ in range(500)]
+                    for key in range(2007, 2023)}
+        salary_dict = SalaryDict()
+        for key, values in salaries.items():
+            for value in values:
+                salary_dict.add_salary(key, value)
+        self.assertEqual(salary_dict.get_average_salary(), {key: int(mean(x)) for key, x in salaries.items()})
+        self.assertEqual(salary_dict.salary_dict[2007].min, min(salaries[2007]))
+        self.assertEqual(salary_dict.salary_dict[2007].max, max(salaries[2007]))
+
+    def test_variance(self):
+        salary_dict = SalaryDict(with_variance=True)
+        for value in [10, 20, 30, 45.5]:
+            salary_dict.add_salary('Москва', value)
+        self.assertAlmostEqual(salary_dict.salary_dict['Москва'].get_variance(), pvariance([10, 20, 30, 45.5]))
+
+    def test_average_is_invalidated(self):
+        salary_dict = SalaryDict()
+        salary_dict.add_salary('Москва', 10)
+        self.assertIs(salary_dict.get_average_salary(), salary_dict.get_average_salary())
+        salary_dict.add_salary('Москва', 20)
+        self.assertEqual(salary_dict.get_average_salary(), {'Москва': 15})
+
+
+class ResultTestCase(CsvFileTestCase):
+    def get_sequential_result(self, job):
+        result = Result(job)
+        result.get_data(map(VacancyForStatistics, csv_reader(self.file_name)))
+        return result
+
+    def assert_same_result(self, result, expected):
+        self.assertEqual(result.print_result(), expected.print_result())
+        self.assertEqual(list(result.job_count_city.count_dict), list(expected.job_count_city.count_dict))
+        self.assertEqual(list(result.job_salary_year.salary_dict), list(expected.job_salary_year.salary_dict))
+
+
+class ParallelResultTests(ResultTestCase):
+    def test_split_csv(self):
+        ranges = split_csv(self.file_name, 4, 100)
+        self.assertEqual(len(ranges), 4)
+        rows = [row for start, end in ranges for row in get_range_rows(self.file_name, start, end)]
+        self.assertEqual(rows, list(csv_reader(self.file_name)))
+
+    def test_small_file_is_not_split(self):
+        self.assertEqual(len(split_csv(self.file_name, 4)), 1)
+
+    def test_same_as_sequential(self):
+        snapshot = StatisticsSnapshot()
+        self.assertEqual(snapshot.update(self.file_name, 3, 100), 30)
+        for job in ['Вакансия 1', 'Нечто']:
+            self.assert_same_result(snapshot.get_result(job), self.get_sequential_result(job))
+
+
+class CsvChunksTests(TestCase):
+    def setUp(self):
+        self.text = 'name,descr\n' + ''.join(f'"Вакансия {i}","Строка\n""{i}""\nстрока"\n' if i % 3 else
+                                              f'Вакансия {i},Описание\n' for i in range(50))
+        self.file_name = create_csv(self.text)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_borders_outside_quotes(self):
+        expected = list(csv_reader(self.file_name))
+        for parts in [1, 2, 7, 50]:
+            ranges = split_csv(self.file_name, parts, 1)
+            self.assertEqual([row for start, end in ranges for row in read_range(self.file_name, start, end)],
+                             expected)
+
+    def test_crlf_newlines(self):
+        file_name = create_csv(self.text.replace('\n', '\r\n'))
+        try:
+            expected = list(get_rows(file_name))[1:]
+            self.assertIn('Строка\n"1"\nстрока', expected[1])
+            for parts in [1, 2, 7]:
+                ranges = split_csv(file_name, parts, 1)
+                self.assertEqual([row for start, end in ranges for row in get_range_rows(file_name, start, end)],
+                                 expected)
+        finally:
+            os.remove(file_name)
+
+    def test_block_size(self):
+        offsets = list(range(0, len(self.text.encode('utf_8_sig')), 17))
+        with open(self.file_name, 'rb') as file:
+            self.assertEqual(find_record_borders(file, offsets, 5), find_record_borders(file, offsets))
+
+    def test_header(self):
+        self.assertEqual(read_header(self.file_name), ['name', 'descr'])
+
+
+class TopNTests(TestCase):
+    def test_same_as_sorted(self):
+        random.seed(2)
+        items = [(f'Город {i}', random.randint(1, 5)) for i in range(200)]
+        self.assertEqual(list(top_n(items, 10).items()), sorted(items, key=lambda x: x[1], reverse=True)[:10])
+        self.assertEqual(list(top_n(items, 3, {'Город 5', 'Город 7'})),
+                         [x for x, _ in sorted(items, key=lambda x: x[1], reverse=True) if x in ('Город 5', 'Город 7')])
+
+    def test_top_salary(self):
+        salary_dict = SalaryDict()
+        count_dict = CountDict()
+        for i in range(300):
+            salary_dict.add_salary(f'Город {i % 30}', i)
+            count_dict.add(f'Город {i % 30}' if i < 200 else 'Москва')
+        count_dict.get_proportion(threshold=0.021, n=2)
+        self.assertEqual(count_dict.top_proportion_dict, {'Москва': 0.3333, 'Город 0': 0.0233})
+        self.assertEqual(count_dict.big_cities, {'Москва'} | {f'Город {i}' for i in range(20)})
+        self.assertEqual(salary_dict.top_salary(count_dict.big_cities, 2), {'Город 19': 154, 'Город 18': 153})
+
+
+class PartitionTests(TestCase):
+    def test_same_as_masks(self):
+        random.seed(4)
+        df = pd.DataFrame({'year': [random.randint(2007, 2012) for _ in range(500)], 'salary': range(500)})
+        partitions = partition(df, 'year', ['salary'])
+        self.assertEqual(list(partitions), list(df['year'].unique()))
+        for year, data in partitions.items():
+            self.assertTrue(data.equals(df[df['year'] == year][['salary']]))
+        with tempfile.TemporaryDirectory() as path, ThreadPoolExecutor(1) as executor:
+            for future in write_partitions(partitions, path, executor):
+                future.result()
+            self.assertEqual(pd.read_csv(os.path.join(path, '2010.csv'))['salary'].tolist(),
+                             partitions[2010]['salary'].tolist())
+
+    def test_shared_arrays(self):
+        shared, count, size, bounds = share_arrays({2007: ([1, 2], [3, 4]), 2008: ([5, 6, 7], [8, 9, 10])})
+        try:
+            self.assertEqual((count, size, bounds), (2, 5, {2007: (0, 2), 2008: (2, 5)}))
+            self.assertEqual(read_shared(lambda x, y: (x.tolist(), y.tolist()), shared.name, count, size, *bounds[2008]),
+                             ([5., 6., 7.], [8., 9., 10.]))
+        finally:
+            shared.close()
+            shared.unlink()
+
+    def test_format(self):
+        self.assertEqual(get_format([]), 'csv')
+        self.assertEqual(get_format(['csv']), 'csv')
+        self.assertRaises(ValueError, get_format, ['xlsx'])
+
+    @skipIf(pyarrow is None, 'pyarrow не установлен')
+    def test_columnar(self):
+        df = pd.DataFrame({'year': [2008, 2007, 2008], 'name': pd.Categorical(['a', 'b', 'a']), 'salary': [1., 2., 3.]})
+        partitions = partition(df, 'year')
+        for file_format in ('parquet', 'feather'):
+            with tempfile.TemporaryDirectory() as path, ThreadPoolExecutor(1) as executor:
+                for future in write_partitions(partitions, path, executor, file_format):
+                    future.result()
+                files = find_partitions(path)
+                self.assertEqual(list(files), [2007, 2008])
+                data = read_partition(files[2008], ['name', 'salary'])
+                self.assertEqual(list(data.columns), ['name', 'salary'])
+                self.assertEqual(data['salary'].tolist(), [1., 3.])
+                self.assertEqual(data['name'].dtype, 'category')
+
+
+class JobMaskTests(TestCase):
+    def setUp(self):
+        spec = importlib.util.spec_from_file_location('year_statistics', '3.2.2-3.2,3.py')
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+
+    def test_missing_name(self):
+        df = pd.DataFrame({'name': pd.Categorical(['Главный аналитик', None, 'Бухгалтер', 'Старший аналитик'])})
+        statistics = self.module.Statistics('аналитик', df, {})
+        self.assertEqual(statistics.get_job_mask(df).tolist(), [True, False, False, True])
+        other = pd.DataFrame({'name': pd.Categorical([None, 'Ведущий аналитик'])})
+        self.assertEqual(statistics.get_job_mask(other).tolist(), [False, True])
+        empty = pd.DataFrame({'name': pd.Categorical([None, None], categories=pd.Index([], dtype=object))})
+        self.assertEqual(statistics.get_job_mask(empty).tolist(), [False, False])
+
+    def test_partition_missing_name(self):
+        df = pd.DataFrame({'name': ['Главный аналитик', None, 'Старший аналитик'], 'salary_from': [10., 20., 30.],
+                           'salary_to': [10., 20., 30.], 'area_name': ['Москва'] * 3})
+        with tempfile.TemporaryDirectory() as path:
+            file_name = os.path.join(path, '2022.csv')
+            df.to_csv(file_name, index=False)
+            self.assertEqual(self.module.partition_year_statistic((2022, file_name, 'аналитик')), [2022, 20, 3, 20, 2])
+
+    def test_reordered_categories(self):
+        df = pd.DataFrame({'name': pd.Categorical(['Аналитик', 'Бухгалтер'])})
+        statistics = self.module.Statistics('Аналитик', df, {})
+        other = pd.DataFrame({'name': pd.Categorical(['Аналитик', 'Бухгалтер'], categories=['Бухгалтер', 'Аналитик'])})
+        self.assertEqual(other['name'].dtype, df['name'].dtype)
+        self.assertEqual(statistics.get_job_mask(other).tolist(), [True, False])
+
+
+class YearSplitTests(TestCase):
+    def setUp(self):
+        spec = importlib.util.spec_from_file_location('year_split', '3.2.1.py')
+        self.module = sys.modules['year_split'] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+
+    def tearDown(self):
+        del sys.modules['year_split']
+
+    def test_salary_dtypes(self):
+        file_name = create_csv('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                               'Аналитик,,200000,RUR,Москва,2022-06-14T11:44:58+0300\n'
+                               'Программист,30,40,RUR,Казань,2021-06-14T11:44:58+0300\n')
+        try:
+            with tempfile.TemporaryDirectory() as path:
+                files = self.module.DataSet.get_folders(file_name, path, 1)
+                with open(files[2022], encoding='utf-8') as file:
+                    self.assertEqual(file.read().splitlines()[1], 'Аналитик,,200000,RUR,Москва,2022-06-14T11:44:58+0300')
+                with open(files[2021], encoding='utf-8') as file:
+                    self.assertEqual(file.read().splitlines()[1], 'Программист,30.0,40,RUR,Казань,2021-06-14T11:44:58+0300')
+        finally:
+            os.remove(file_name)
+
+    def test_common_dtypes(self):
+        parts = [([2022], {'salary_from': 'int64', 'salary_to': 'int64'}),
+                 ([2021], {'salary_from': 'float64', 'salary_to': 'int64'})]
+        self.assertEqual(self.module.get_common_dtypes(parts), {'salary_from': 'float64', 'salary_to': 'int64'})
+        parts.append(([2020], {'salary_from': 'str', 'salary_to': 'int64'}))
+        self.assertEqual(self.module.get_common_dtypes(parts), {'salary_from': 'str', 'salary_to': 'int64'})
+
+
+class StatisticsSnapshotTests(ResultTestCase):
+    def test_same_as_sequential(self):
+        for job in ['Вакансия 1', 'Вакансия', 'Нечто']:
+            self.assert_same_result(get_snapshot_result(self.file_name, job), self.get_sequential_result(job))
+
+    def test_appended_rows(self):
+        self.write_csv(self.rows[:20])
+        get_snapshot_result(self.file_name, 'Вакансия 1')
+        self.write_csv(self.rows)
+        snapshot = StatisticsSnapshot.load(self.file_name)
+        self.assertEqual(snapshot.update(self.file_name), 10)
+        self.assert_same_result(snapshot.get_result('Вакансия 1'), self.get_sequential_result('Вакансия 1'))
+
+    def test_saved_as_json(self):
+        snapshot = StatisticsSnapshot()
+        snapshot.update(self.file_name)
+        snapshot.save(self.file_name)
+        with open(StatisticsSnapshot.get_path(self.file_name), encoding='utf-8') as file:
+            self.assertEqual(json.load(file)['rows'], 30)
+        loaded = StatisticsSnapshot.load(self.file_name)
+        self.assertEqual(loaded.update(self.file_name), 0)
+        self.assertEqual(list(loaded.count_year.count_dict), list(snapshot.count_year.count_dict))
+        self.assert_same_result(loaded.get_result('Вакансия 1'), self.get_sequential_result('Вакансия 1'))
+        with open(StatisticsSnapshot.get_path(self.file_name), 'w', encoding='utf-8') as file:
+            file.write('{"version": 3, "rows": []}')
+        self.assertEqual(StatisticsSnapshot.load(self.file_name).rows, 0)
+
+    def test_rewritten_file(self):
+        self.write_csv(self.rows[5:])
+        snapshot = StatisticsSnapshot()
+        snapshot.update(self.file_name)
+        backfilled = [row[:11] + ['2022-01-01T10:00:00+0300'] for row in self.rows[:5]]
+        self.write_csv(backfilled + self.rows[10:])
+        self.assertEqual(snapshot.update(self.file_name), 25)
+        self.assertEqual(snapshot.rows, 25)
+        self.assert_same_result(snapshot.get_result('Вакансия 1'), self.get_sequential_result('Вакансия 1'))
+
+
+class SubstringMatcherTests(TestCase):
+    def test_same_as_in(self):
+        random.seed(4)
+        patterns = ['а', 'ан', 'нал', 'Аналитик', 'литик', 'ик', 'Программист', '', 'ана']
+        matcher = SubstringMatcher(patterns)
+        for _ in range(300):
+            text = ''.join(random.choices('Аналитикпрограммист ', k=random.randint(0, 20)))
+            self.assertEqual(matcher.find(text), tuple(i for i, x in enumerate(patterns) if x in text))
+        self.assertEqual(matcher.find('Аналитик данных'), (0, 1, 2, 3, 4, 5, 7))
+
+
+class MultiResultTests(ResultTestCase):
+    def test_same_as_single_job(self):
+        jobs = ['Вакансия 1', 'Вакансия', 'Нечто', 'я 2', 'Вакансия']
+        results = get_results(self.file_name, jobs)
+        self.assertEqual(list(results), jobs[:4])
+        for job in jobs:
+            expected = self.get_sequential_result(job)
+            self.assert_same_result(results[job], expected)
+            self.assertEqual(results[job].get_excel_data(), expected.get_excel_data())
+
+
+def create_rates_xml(day):
+    month = int(day[3:5])
+    valutes = [('USD', 1, f'{30 + month},{month:04d}'), ('KZT', 100, f'{month},5')]
+    if month % 2:
+        valutes.append(('EUR', 1, f'{40 + month},25'))
+    return (f'<?xml version="1.0" encoding="windows-1251"?><ValCurs Date="{day}" name="Курсы">' +
+            ''.join(f'<Valute><CharCode>{x}</CharCode><Nominal>{y}</Nominal><Name>Валюта</Name><Value>{z}</Value>'
+                    f'</Valute>' for x, y, z in valutes) + '</ValCurs>').encode('WINDOWS-1251')
+
+
+class RatesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        day = parse_qs(urlparse(self.path).query)['date_req'][0]
+        self.server.requests.append(day)
+        if self.server.failures.get(day, 0):
+            self.server.failures[day] -= 1
+            self.send_error(503)
+            return
+        content = create_rates_xml(day)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml; charset=windows-1251')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class RateFetcherTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RatesHandler)
+        self.server.requests = []
+        self.server.failures = {}
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.months = [f'{x:02d}/2021' for x in range(1, 13)]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def create_fetcher(self):
+        return RateFetcher(self.directory.name, f'http://127.0.0.1:{self.server.server_port}/scripts/XML_daily.asp',
+                           workers=4, backoff=0.01)
+
+    def test_parse_rates(self):
+        self.assertEqual(parse_rates(create_rates_xml('28/02/2021'), ['EUR', 'KZT', 'USD']),
+                         {'EUR': None, 'KZT': 0.025, 'USD': 32.0002})
+
+    def test_cache(self):
+        rates = self.create_fetcher().get_rates(self.months, ['USD', 'EUR'])
+        self.assertEqual(list(rates), self.months)
+        self.assertEqual(rates['03/2021'], {'USD': 33.0003, 'EUR': 43.25})
+        self.assertEqual(sorted(self.server.requests), [f'28/{x}' for x in self.months])
+        self.assertEqual(self.create_fetcher().get_rates(self.months + ['01/2022'], ['USD', 'EUR']),
+                         {**rates, '01/2022': {'USD': 31.0001, 'EUR': 41.25}})
+        self.assertEqual(self.server.requests[12:], ['28/01/2022'])
+
+    def test_retry(self):
+        self.server.failures = {'28/05/2021': 2}
+        self.assertEqual(self.create_fetcher().get_rates(['05/2021'], ['USD'])['05/2021'], {'USD': 35.0005})
+        self.assertEqual(self.server.requests, ['28/05/2021'] * 3)
+        self.server.failures = {'28/06/2021': 4}
+        with self.assertRaises(requests.HTTPError):
+            self.create_fetcher().get_rates(['06/2021'], ['USD'])
+
+
+class ConvertSalariesTests(TestCase):
+    def test_same_as_rows(self):
+        currency_df = pd.DataFrame([['2021-01', 70.5, None, 0.175], ['2021-02', 71.25, 90.5, 0.18]],
+                                   columns=['date', 'USD', 'EUR', 'KZT'], dtype=object)
+        df = pd.DataFrame([['a', 1000., 2000., 'USD', 'Москва', '2021-02-01T10:00:00+0300'],
+                           ['b', None, 3., 'USD', 'Пермь', '2021-01-05T10:00:00+0300'],
+                           ['c', 100., None, 'EUR', 'Казань', '2021-01-05T10:00:00+0300'],
+                           ['d', 2.5, None, 'RUR', 'Москва', '2021-02-05T10:00:00+0300'],
+                           ['e', 3.5, None, 'UAH', 'Москва', '2021-02-05T10:00:00+0300'],
+                           ['f', None, None, 'KZT', 'Москва', '2021-02-05T10:00:00+0300'],
+                           ['g', 10000., 10001., None, 'Москва', '2021-01-05T10:00:00+0300']],
+                          columns=['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'])
+        result = convert_salaries(df, currency_df)
+        self.assertEqual(list(result.columns), ['name', 'salary', 'area_name', 'published_at'])
+        self.assertEqual(str(result['salary'].dtype), 'Int64')
+        self.assertEqual([None if pd.isna(x) else x for x in result['salary']],
+                         [106875, 212, None, 2, 4, None, 10000])
+
+    def test_create_all_csv(self):
+        currency_df = pd.DataFrame([['2020-12', 70.5], ['2021-01', 71.25]], columns=['date', 'USD'])
+        df = pd.DataFrame([[f'Вакансия {i}', 100. * i, None, ['RUR', 'USD'][i % 2], 'Москва',
+                            f'202{i % 2}-{12 - 11 * (i % 2):02d}-05T10:00:00+0300'] for i in range(10)],
+                          columns=['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'])
+        expected = convert_salaries(df, currency_df)
+        with tempfile.TemporaryDirectory() as path:
+            new_csv = NewCsv(df, currency_df)
+            self.assertEqual(new_csv.create_all_csv(path, processes=1), {2020: 5, 2021: 5})
+            self.assertEqual(pd.read_csv(os.path.join(path, '2021.csv'))['salary'].tolist(),
+                             expected['salary'][1::2].tolist())
+            file_name = os.path.join(path, 'all.csv')
+            new_csv.create_all_csv(file_name=file_name, processes=1)
+            self.assertEqual(pd.read_csv(file_name)['salary'].tolist(), expected['salary'].tolist())
+
+
+class RateTableTests(TestCase):
+    def setUp(self):
+        self.table = RateTable.from_rows(['date', 'USD', 'EUR'], [['2021-01', '70.5', ''], ['2021-03', 72, 90.5]])
+
+    def test_get_rate(self):
+        self.assertEqual(self.table.rates.shape, (3, 2))
+        self.assertEqual(self.table.get_rate('USD', '2021-03-05T10:00:00+0300'), 72)
+        self.assertEqual(self.table.get_rate('RUR', '2030-01-01'), 1)
+        self.assertEqual(self.table.get_rate('KZT', '2021-01-01', 1.0), 1)
+        for currency, date in [('EUR', '2021-01-01'), ('USD', '2021-02-01'), ('USD', '2020-12-31'), ('USD', '2021-04')]:
+            self.assertNotEqual(self.table.get_rate(currency, date), self.table.get_rate(currency, date))
+
+    def test_get_rates(self):
+        currencies = ['USD', 'EUR', 'RUR', 'KZT', None, 'USD', 'USD', 'EUR']
+        dates = ['2021-01-02', '2021-03-01', '2021-02-01', '2021-01-01', '2021-01-01', '2021-02-01', '2022-01-01', 'nan']
+        rates = self.table.get_rates(currencies, dates, 1.0)
+        self.assertEqual(rates[:5].tolist(), [70.5, 90.5, 1, 1, 1])
+        self.assertTrue(all(x != x for x in rates[5:]))
+        self.assertEqual(self.table.convert([10, 20], ['USD', 'EUR'], ['2021-03-01', '2021-03-01']).tolist(), [720, 1810])
+
+    def test_full_rates(self):
+        try:
+            set_rate_table(self.table)
+            self.assertEqual(VacancyForStatistics(['a', '100', '200', 'USD', 'Москва', '2021-03-05T10:00:00+0300']).salary,
+                             150 * 72)
+            self.assertEqual(VacancyForStatistics(['a', '100', '200', 'USD', 'Москва', '2021-02-05T10:00:00+0300']).salary,
+                             150 * 60.66)
+            self.assertEqual(get_cache_kind('statistics'), f'statistics-{self.table.key}')
+        finally:
+            set_rate_table(None)
+        self.assertEqual(get_cache_kind('statistics'), 'statistics')
+
+    def test_load_rate_table(self):
+        file_name = create_csv('date,BYR,USD\n2021-01,,70.5\n2021-03,0.03,72.0\n')
+        try:
+            table = load_rate_table(file_name)
+            self.assertEqual(table.currencies, ['BYR', 'USD'])
+            self.assertEqual(Salary(['100', '200', 'True', 'USD'], '2021-03-05T10:00:00+0300').average_salary, 150 * 72)
+            self.assertEqual(Salary(['100', '200', 'True', 'BYR'], '2021-01-05T10:00:00+0300').average_salary,
+                             150 * 23.91)
+        finally:
+            set_rate_table(None)
+            os.remove(file_name)
+
+
+class DatasetProfileTests(TestCase):
+    def setUp(self):
+        self.file_name = create_csv('name,salary_currency,published_at\n'
+                                    'a,USD,2003-01-01T01:00:00+0300\n'
+                                    'b,,2003-01-01T00:30:00+0000\n'
+                                    'c,RUR,2004-05-01T00:00:00-0300\n'
+                                    'd,USD,2003-01-01T00:30:00+0100\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.file_name + '.cache', ignore_errors=True)
+        os.remove(self.file_name)
+
+    def test_profile(self):
+        profile = load_profile(self.file_name)
+        self.assertEqual(profile['rows'], 4)
+        self.assertEqual(profile['currencies'], {'USD': 2, 'RUR': 1})
+        self.assertEqual(profile['null_rates'], {'name': 0, 'salary_currency': 0.25, 'published_at': 0})
+        self.assertEqual(profile['published_at'], {'first': '2003-01-01T01:00:00+0300', 'min': '2003-01-01T01:00:00+0300',
+                                                   'max': '2004-05-01T00:00:00-0300'})
+        self.assertEqual(profile['years']['2003'], ['2003-01-01T01:00:00+0300', '2003-01-01T00:30:00+0000'])
+
+    def test_missing_dates(self):
+        df = pd.DataFrame({'salary_currency': ['USD', 'RUR', 'USD'],
+                           'published_at': ['2003-01-01T01:00:00+0300', None, '2003-01-01T00:30:00+0000']})
+        self.assertEqual(get_moments(df['published_at']).isna().tolist(), [False, True, False])
+        profile = create_profile(df)
+        self.assertEqual(profile['published_at']['max'], '2003-01-01T00:30:00+0000')
+        self.assertEqual(list(profile['years']), ['2003'])
+        empty = create_profile(pd.DataFrame({'salary_currency': ['USD'], 'published_at': [float('nan')]}))
+        self.assertEqual(empty['published_at'], {'first': None, 'min': None, 'max': None})
+        self.assertEqual(empty['years'], {})
+        self.assertTrue(get_moments(pd.Series([None, None], dtype=object)).isna().all())
+
+    def test_cache(self):
+        profile = load_profile(self.file_name)
+        self.assertTrue(os.path.exists(get_profile_path(self.file_name)))
+        self.assertEqual(load_profile(self.file_name, 'не читается'), profile)
+        with open(self.file_name, 'a', encoding='utf-8') as file:
+            file.write('e,EUR,2005-01-01T00:00:00+0300\n')
+        self.assertEqual(load_profile(self.file_name)['currencies'], {'USD': 2, 'RUR': 1, 'EUR': 1})